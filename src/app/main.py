@@ -1,77 +1,114 @@
 # pyright: reportMissingImports=false
-import uuid
+import asyncio
+import hashlib
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 from fastapi import FastAPI, Form, HTTPException, Query, Request, Response
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pydantic import BaseModel
 
 from src.config import get_settings
 from src.core.assistant import interpret_message
-from src.core.diff import diff_change_ratio, diff_texts_html
+from src.core.diff import diff_both, diff_texts_html
 from src.core.extract import extract_title_text
-from src.core.fetch import fetch_live
+from src.core.fetch import close_async_client, fetch_live
 from src.core.summarize import summarize_changes
-from src.core.wayback import fetch_archive_html, pick_snapshots
+from src.core.wayback import fetch_all_archives, pick_snapshots
 from src.storage.db import (
-    create_report,
+    close_pool,
+    create_report_with_snapshots,
+    created_at_iso,
+    get_pool,
     get_report,
-    get_snapshot_html,
+    get_snapshot_meta,
     init_db,
+    iter_snapshot_html,
+    list_report_diffs,
     list_snapshots,
     purge_old_reports,
-    save_snapshot,
+    save_report_diffs,
+    start_write_queue,
+    stop_write_queue,
 )
 from src.storage.db import vacuum as db_vacuum
 
 env = Environment(
     loader=FileSystemLoader("templates"),
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=False,
+    cache_size=400,
 )
 
+# Templates never change at runtime (auto_reload off), so fetch the
+# compiled objects once instead of looking them up per request.
+WIZARD_TMPL = env.get_template("wizard.html")
+REPORT_TMPL = env.get_template("report.html")
+ERROR_TMPL = env.get_template("error.html")
+
 app = FastAPI(title="Mandela Report", version="0.1.0")
 settings = get_settings()
 
+# Process pool for CPU-bound helpers (difflib, HTML extraction) so they
+# don't stall the single-threaded event loop on large pages.
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+
+
+async def _run_cpu(fn, *args):
+    """Run a CPU-bound function off the event loop when the pool is up."""
+    if _cpu_executor is None:
+        return fn(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cpu_executor, fn, *args)
+
+
+# Minimal, conservative CSP: only allow same-origin for styles, images
+# and frames. Built once; the values never change at runtime.
+_CSP = (
+    "default-src 'none'; "
+    "img-src 'self' data:; "
+    "style-src 'self' 'unsafe-inline'; "
+    "font-src 'self' data:; "
+    "frame-ancestors 'none'; "
+    "base-uri 'self';"
+)
+# 1 year plus preload hint
+_HSTS = "max-age=31536000; includeSubDomains; preload"
+
+# Full header table, resolved once at import. HSTS is included only when
+# settings enforce TLS (do not enable in dev); settings are validated at
+# startup so no per-request guard is needed.
+_STATIC_HEADERS: tuple = (
+    ("Content-Security-Policy", _CSP),
+    ("X-Frame-Options", "DENY"),
+    ("X-Content-Type-Options", "nosniff"),
+    ("Referrer-Policy", "same-origin"),
+) + (
+    (("Strict-Transport-Security", _HSTS),)
+    if getattr(settings, "enforce_https", False)
+    else ()
+)
+
 
 @app.middleware("http")
 async def security_headers_middleware(request: Request, call_next):
     """Add common security-related HTTP headers to every response.
 
-    - Content-Security-Policy: restrict sources; do not allow inline
-      scripts by default.
-    - X-Frame-Options: DENY
-    - X-Content-Type-Options: nosniff
-    - Referrer-Policy: same-origin
-    - Strict-Transport-Security (HSTS): enabled only when behind TLS
-      (based on settings)
+    The header set is fixed at import time (see _STATIC_HEADERS); the
+    per-request work is a handful of setdefault calls.
     """
     resp: Response = await call_next(request)
-    # Minimal, conservative CSP: only allow same-origin for styles,
-    # images and frames
-    csp = (
-        "default-src 'none'; "
-        "img-src 'self' data:; "
-        "style-src 'self' 'unsafe-inline'; "
-        "font-src 'self' data:; "
-        "frame-ancestors 'none'; "
-        "base-uri 'self';"
-    )
-    resp.headers.setdefault("Content-Security-Policy", csp)
-    resp.headers.setdefault("X-Frame-Options", "DENY")
-    resp.headers.setdefault("X-Content-Type-Options", "nosniff")
-    resp.headers.setdefault("Referrer-Policy", "same-origin")
-    # Only set HSTS when settings indicate TLS enforcement
-    # (do not enable in dev)
-    try:
-        if getattr(settings, "enforce_https", False):
-            # 1 year plus preload hint
-            hsts_val = "max-age=31536000; includeSubDomains; preload"
-            resp.headers.setdefault("Strict-Transport-Security", hsts_val)
-    except Exception:
-        pass
+    for key, value in _STATIC_HEADERS:
+        resp.headers.setdefault(key, value)
     return resp
 
 
@@ -82,20 +119,93 @@ class DiffRequest(BaseModel):
     snapshots: int = 3  # number of historical snapshots to compare
 
 
+# Strips the "-", ":" and " " separators from an ISO timestamp in one
+# C-level pass (Wayback URLs want bare YYYYMMDDhhmmss).
+_WB_URL_TRANS = str.maketrans("", "", "-: ")
+
+
+def _view_url_for(source: str, when: str, url: str) -> str:
+    if source == "wayback":
+        return f"https://web.archive.org/web/{when.translate(_WB_URL_TRANS)}/{url}"
+    if source == "live":
+        return url
+    return ""
+
+
+def _build_pairs(snaps_sorted):
+    """Select the snapshot pairs to diff from a "when"-ordered list.
+
+    Returns (pairs, live) where pairs is a list of (from, to, label)
+    tuples and live is the live snapshot if present.
+    """
+    pairs = []
+    if len(snaps_sorted) >= 2:
+        pairs.append(
+            (
+                snaps_sorted[0],
+                snaps_sorted[-1],
+                "Historical change (first vs last Wayback)",
+            )
+        )
+    live = next((s for s in snaps_sorted if s["source"] == "live"), None)
+    last_wb = next(
+        (s for s in reversed(snaps_sorted) if s["source"] == "wayback"),
+        None,
+    )
+    if live and last_wb:
+        pairs.append((last_wb, live, "Recent change (last Wayback vs Live)"))
+    return pairs, live
+
+
+async def _build_diffs(pairs, with_stats: bool = False):
+    """Render diff HTML (and optionally stats) for each snapshot pair."""
+    if with_stats:
+        # diff_both shares tokenization and opcodes between the HTML and
+        # the stats instead of running the matcher twice per pair.
+        both = await asyncio.gather(
+            *[_run_cpu(diff_both, a["text"], b["text"]) for a, b, _ in pairs]
+        )
+        diff_htmls = [h for h, _ in both]
+        diff_stats = [s for _, s in both]
+    else:
+        diff_htmls = await asyncio.gather(
+            *[_run_cpu(diff_texts_html, a["text"], b["text"]) for a, b, _ in pairs]
+        )
+        diff_stats = [None] * len(pairs)
+    diffs = []
+    for (a, b, label), html_out, stats in zip(pairs, diff_htmls, diff_stats):
+        d = {
+            "label": label,
+            "from_when": a["when"],
+            "to_when": b["when"],
+            "html": html_out,
+        }
+        if with_stats:
+            d["stats"] = stats
+        diffs.append(d)
+    return diffs
+
+
 def parse_date(s: Optional[str]) -> Optional[datetime]:
     if not s:
         return None
-    return datetime.strptime(s, "%Y-%m-%d")
+    # fromisoformat is C-accelerated (3.11+) and handles YYYY-MM-DD
+    # without re-parsing a format string on every call like strptime.
+    return datetime.fromisoformat(s)
 
 
 @app.on_event("startup")
 async def on_startup():
     await init_db()
+    # Keep the warm connection pool reachable for debugging/inspection
+    app.state.db_pool = get_pool()
+    # Background snapshot writer takes HTML commits off the request path
+    start_write_queue()
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ProcessPoolExecutor(max_workers=os.cpu_count())
     # Kick off background retention worker
     if settings.retention_enabled:
-        # start_retention_worker returns a callable that itself starts the
-        # actual asyncio task. Call it here to schedule the background
-        # coroutine rather than registering another startup handler.
         start_retention_worker()
     # Mount static assets (logo, favicon)
     try:
@@ -105,11 +215,28 @@ async def on_startup():
         pass
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    await stop_write_queue()
+    await close_pool()
+    await close_async_client()
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
+
+
 def start_retention_worker():
-    async def _worker():
-        import asyncio
+    loop = asyncio.get_running_loop()
+    interval = settings.retention_interval_hours * 3600
 
+    async def _worker():
+        # Anchor runs to the monotonic clock so the cadence doesn't
+        # drift by however long each purge takes.
+        next_run = loop.time()
         while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            next_run += interval
             try:
                 deleted = await purge_old_reports(settings.retention_days)
                 if deleted and settings.vacuum_after_purge:
@@ -117,25 +244,14 @@ def start_retention_worker():
             except Exception:
                 # Best-effort: don't crash app due to housekeeping error
                 pass
-            # sleep between runs
-            await asyncio.sleep(settings.retention_interval_hours * 3600)
 
-    import asyncio
-
-    loop = asyncio.get_event_loop()
-    loop.create_task(_worker())
-    # return a no-op callback for the startup handler API
-
-    async def _noop():
-        return None
-
-    return _noop
+    # Keep a reference on app.state so the task can't be garbage-collected
+    app.state.retention_task = loop.create_task(_worker(), name="retention")
 
 
 @app.get("/", response_class=HTMLResponse)
 async def wizard_view():
-    template = env.get_template("wizard.html")
-    return HTMLResponse(template.render())
+    return HTMLResponse(WIZARD_TMPL.render())
 
 
 @app.post("/assistant")
@@ -160,130 +276,138 @@ async def make_diff(req: DiffRequest):
     if since_dt and since_dt > until_dt:
         raise HTTPException(400, "since must be <= until")
 
-    report_id = str(uuid.uuid4())
-    await create_report(report_id=report_id, url=url)
+    # 96 bits of randomness in 16 URL-safe chars -- collision-proof for
+    # this app and less than half the size of a uuid4 string in index
+    # pages and URLs.
+    report_id = secrets.token_urlsafe(12)
 
-    # 1) Fetch live (respect robots)
-    live_html: Optional[str] = None
-    try:
-        live_res = await fetch_live(
+    # Collect rows; the report and its snapshots are inserted together
+    # in one transaction once the fetches settle.
+    snapshot_rows = []
+
+    # 1+2) The live fetch and the Wayback CDX query are independent;
+    # run them concurrently to save one sequential round-trip.
+    # pick_snapshots is a blocking requests call, so it goes to a thread.
+    live_res, wb = await asyncio.gather(
+        fetch_live(
             url=url,
             ua=settings.user_agent,
             timeout=settings.request_timeout,
             max_mb=settings.max_response_mb,
             obey_robots=settings.obey_robots,
-        )
-        if live_res.allowed and live_res.html:
+        ),
+        asyncio.to_thread(
+            pick_snapshots,
+            url=url,
+            since=since_dt,
+            until=until_dt,
+            count=max(1, req.snapshots),
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(wb, BaseException):
+        wb = []
+
+    live_html: Optional[str] = None
+    try:
+        if (
+            not isinstance(live_res, BaseException)
+            and live_res.allowed
+            and live_res.html
+        ):
             live_html = live_res.html
-            title, text = extract_title_text(live_html)
-            await save_snapshot(
-                report_id=report_id,
-                source="live",
-                when=datetime.utcnow().isoformat(),
-                url=url,
-                title=title,
-                text=text,
-                html=live_html,
+            title, text = await _run_cpu(extract_title_text, live_html)
+            snapshot_rows.append(
+                (
+                    report_id,
+                    "live",
+                    datetime.utcnow().isoformat(),
+                    url,
+                    title,
+                    text,
+                    live_html,
+                )
             )
     except Exception:
         pass
-
-    # 2) Pick Wayback snapshots
-    wb = pick_snapshots(
-        url=url,
-        since=since_dt,
-        until=until_dt,
-        count=max(1, req.snapshots),
-    )
-    # 3) Fetch Wayback HTML and store
-    for meta in wb:
+    # 3) Fetch Wayback HTML concurrently on the shared async client;
+    # total latency is then the slowest fetch rather than the sum of all
+    # of them, and the Semaphore inside keeps us polite to archive.org.
+    results = await fetch_all_archives(wb, ua=settings.user_agent)
+    for meta, html in zip(wb, results):
+        if html is None:
+            continue
         try:
-            html = fetch_archive_html(
-                meta["archive_url"],
-                ua=settings.user_agent,
-            )
-            title, text = extract_title_text(html)
-            await save_snapshot(
-                report_id=report_id,
-                source="wayback",
-                when=meta["timestamp"],
-                url=meta["original"],
-                title=title,
-                text=text,
-                html=html,
+            title, text = await _run_cpu(extract_title_text, html)
+            snapshot_rows.append(
+                (
+                    report_id,
+                    "wayback",
+                    meta["timestamp"],
+                    meta["original"],
+                    title,
+                    text,
+                    html,
+                )
             )
         except Exception:
             continue
 
-    # 4) Build diffs
-    snaps = await list_snapshots(report_id)
-    if not snaps:
+    await create_report_with_snapshots(report_id, url, snapshot_rows)
+
+    # 4) Build diffs (list_snapshots returns rows ordered by "when")
+    snaps_sorted = await list_snapshots(report_id)
+    if not snaps_sorted:
         raise HTTPException(404, "No snapshots available for diff")
 
-    snaps_sorted = sorted(snaps, key=lambda s: s["when"])
-    pairs = []
-    if len(snaps_sorted) >= 2:
-        pairs.append(
+    pairs, live = _build_pairs(snaps_sorted)
+    diffs = await _build_diffs(pairs, with_stats=True)
+    # Diff HTML is immutable once the report exists; cache it so
+    # /report/{id} views skip re-rendering.
+    await save_report_diffs(
+        report_id,
+        [
             (
-                snaps_sorted[0],
-                snaps_sorted[-1],
-                "Historical change (first vs last Wayback)",
+                d["label"],
+                d["from_when"],
+                d["to_when"],
+                d["html"],
+                d["stats"]["ratio"],
             )
-        )
-    live = next((s for s in snaps_sorted if s["source"] == "live"), None)
-    last_wb = next(
-        (s for s in reversed(snaps_sorted) if s["source"] == "wayback"),
-        None,
-    )
-    if live and last_wb:
-        pairs.append((last_wb, live, "Recent change (last Wayback vs Live)"))
-
-    diffs = [
-        {
-            "label": label,
-            "from_when": a["when"],
-            "to_when": b["when"],
-            "html": diff_texts_html(a["text"], b["text"]),
-            "stats": diff_change_ratio(a["text"], b["text"]),
-        }
-        for a, b, label in pairs
-    ]
-
-    summary = summarize_changes(
-        url=url,
-        pairs=[
-            {
-                "label": d["label"],
-                "from_when": d["from_when"],
-                "to_when": d["to_when"],
-            }
             for d in diffs
         ],
-        from_text=snaps_sorted[0]["text"],
-        to_text=(live["text"] if live else snaps_sorted[-1]["text"]),
-        provider=settings.summary_provider,
-        llm_base_url=settings.llm_base_url,
-        ua=settings.user_agent,
     )
-    # Build snapshot link helpers
-
-    def view_url_for(source: str, when: str, url: str) -> str:
-        if source == "wayback":
-            ts = when.replace("-", "").replace(":", "").replace(" ", "")
-            return f"https://web.archive.org/web/{ts}/{url}"
-        if source == "live":
-            return url
-        return ""
 
+    # A single snapshot produces no pairs; don't pay an LLM round-trip
+    # just to say so.
+    if diffs:
+        summary = summarize_changes(
+            url=url,
+            pairs=[
+                {
+                    "label": d["label"],
+                    "from_when": d["from_when"],
+                    "to_when": d["to_when"],
+                }
+                for d in diffs
+            ],
+            from_text=snaps_sorted[0]["text"],
+            to_text=(live["text"] if live else snaps_sorted[-1]["text"]),
+            provider=settings.summary_provider,
+            llm_base_url=settings.llm_base_url,
+            ua=settings.user_agent,
+        )
+    else:
+        summary = "No changes to summarize."
     snaps_out = [
         {
-            "id": s.get("id"),
+            "id": s["id"],
             "source": s["source"],
             "when": s["when"],
             "url": s["url"],
-            "title": s.get("title"),
-            "view_url": view_url_for(s["source"], s["when"], s["url"]),
-            "report_url": f"/snapshot/{s.get('id')}" if s.get("id") else "",
+            "title": s["title"],
+            "view_url": _view_url_for(s["source"], s["when"], s["url"]),
+            "report_url": f"/snapshot/{s['id']}",
         }
         for s in snaps_sorted
     ]
@@ -302,27 +426,22 @@ async def make_diff(req: DiffRequest):
             wb_dt = datetime.fromisoformat(earliest_wb["when"])  # naive UTC
             delta = (wb_dt - since_dt).days
             if delta > GAP_DAYS:
-                msg = (
-                    "Earliest Wayback archive is {} ({} days after "
-                    "requested start {})."
-                ).format(
-                    wb_dt.date().isoformat(),
-                    delta,
-                    since_dt.date().isoformat(),
+                wb_date = wb_dt.date().isoformat()
+                since_date = since_dt.date().isoformat()
+                notices.append(
+                    f"Earliest Wayback archive is {wb_date} ({delta} days "
+                    f"after requested start {since_date})."
                 )
-                notices.append(msg)
         if latest_wb and until_dt:
             wb_dt = datetime.fromisoformat(latest_wb["when"])  # naive UTC
             delta = (until_dt - wb_dt).days
             if delta > GAP_DAYS:
-                msg = (
-                    "Latest Wayback archive is {} ({} days before " "requested end {})."
-                ).format(
-                    wb_dt.date().isoformat(),
-                    delta,
-                    until_dt.date().isoformat(),
+                wb_date = wb_dt.date().isoformat()
+                until_date = until_dt.date().isoformat()
+                notices.append(
+                    f"Latest Wayback archive is {wb_date} ({delta} days "
+                    f"before requested end {until_date})."
                 )
-                notices.append(msg)
     except Exception:
         # best-effort; do not fail diff if parsing notices fails
         pass
@@ -376,112 +495,144 @@ async def wizard_submit(
         )
     except HTTPException as ex:
         if ex.status_code == 404:
-            template = env.get_template("error.html")
             msg = (
                 "No snapshots were available to compare. The page may not be "
                 "archived for the selected dates, or access may be restricted."
             )
-            return HTMLResponse(template.render(message=msg), status_code=200)
+            return HTMLResponse(ERROR_TMPL.render(message=msg), status_code=200)
         raise
 
 
 @app.get("/report/{report_id}", response_class=HTMLResponse)
 async def report_view(
     report_id: str,
+    request: Request,
     style: Optional[str] = Query(default=None),
 ):
+    # Reports are immutable once created, so the rendered page only
+    # depends on (report_id, style); a deterministic ETag lets browsers
+    # revalidate with a 304 instead of a full re-render.
+    etag_src = f"{report_id}:{style or ''}"
+    etag = f'"{hashlib.sha1(etag_src.encode()).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
     report = await get_report(report_id)
     if not report:
         raise HTTPException(404, "Report not found")
-    snaps = await list_snapshots(report_id)
-    if not snaps:
+    # list_snapshots returns rows ordered by "when"
+    snaps_sorted = await list_snapshots(report_id)
+    if not snaps_sorted:
         raise HTTPException(404, "No snapshots for report")
 
-    snaps_sorted = sorted(snaps, key=lambda s: s["when"])
-    pairs = []
-    if len(snaps_sorted) >= 2:
-        pairs.append(
-            (
-                snaps_sorted[0],
-                snaps_sorted[-1],
-                "Historical change (first vs last Wayback)",
-            )
+    pairs, live = _build_pairs(snaps_sorted)
+    diffs = await list_report_diffs(report_id)
+    if not diffs:
+        # Reports created before the diff cache existed: render once and
+        # backfill so the next view is a plain read.
+        diffs = await _build_diffs(pairs, with_stats=True)
+        await save_report_diffs(
+            report_id,
+            [
+                (
+                    d["label"],
+                    d["from_when"],
+                    d["to_when"],
+                    d["html"],
+                    d["stats"]["ratio"],
+                )
+                for d in diffs
+            ],
         )
-    live = next((s for s in snaps_sorted if s["source"] == "live"), None)
-    last_wb = next(
-        (s for s in reversed(snaps_sorted) if s["source"] == "wayback"),
-        None,
-    )
-    if live and last_wb:
-        pairs.append((last_wb, live, "Recent change (last Wayback vs Live)"))
-
-    diffs = [
-        {
-            "label": label,
-            "from_when": a["when"],
-            "to_when": b["when"],
-            "html": diff_texts_html(a["text"], b["text"]),
-        }
-        for a, b, label in pairs
-    ]
 
     # allow optional override of summary provider via ?style=llm|rule
     provider = settings.summary_provider
     if style in {"llm", "rule"}:
         provider = style
 
-    summary = summarize_changes(
-        url=report["url"],
-        pairs=[
-            {
-                "label": d["label"],
-                "from_when": d["from_when"],
-                "to_when": d["to_when"],
-            }
-            for d in diffs
-        ],
-        from_text=snaps_sorted[0]["text"],
-        to_text=(live["text"] if live else snaps_sorted[-1]["text"]),
-        provider=provider,
-        llm_base_url=settings.llm_base_url,
-        ua=settings.user_agent,
-    )
+    if diffs:
+        summary = summarize_changes(
+            url=report["url"],
+            pairs=[
+                {
+                    "label": d["label"],
+                    "from_when": d["from_when"],
+                    "to_when": d["to_when"],
+                }
+                for d in diffs
+            ],
+            from_text=snaps_sorted[0]["text"],
+            to_text=(live["text"] if live else snaps_sorted[-1]["text"]),
+            provider=provider,
+            llm_base_url=settings.llm_base_url,
+            ua=settings.user_agent,
+        )
+    else:
+        summary = "No changes to summarize."
 
-    template = env.get_template("report.html")
-    html = template.render(
+    html = REPORT_TMPL.render(
         url=report["url"],
-        created_at=report["created_at"],
+        created_at=created_at_iso(report["created_at"]),
         diffs=diffs,
         summary=summary,
     )
-    return HTMLResponse(content=html)
+    return HTMLResponse(
+        content=html,
+        headers={"ETag": etag, "Cache-Control": "private, max-age=3600"},
+    )
+
+
+# Headers for the raw snapshot response: the sandbox CSP prevents script
+# execution and subresource loads; SAMEORIGIN framing lets the
+# /snapshot/{id} wrapper embed it (the middleware would default to DENY).
+_SNAPSHOT_RAW_HEADERS = {
+    "Content-Security-Policy": "sandbox; default-src 'none'",
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "SAMEORIGIN",
+}
+
+
+@app.get("/snapshot/{snapshot_id}/raw", response_class=HTMLResponse)
+async def snapshot_raw(snapshot_id: int):
+    """Stream the captured HTML directly, locked down for iframe embedding."""
+    snap = await get_snapshot_meta(snapshot_id)
+    if not snap:
+        raise HTTPException(404, "Snapshot not found")
+    if not snap["html_len"]:
+        return HTMLResponse(
+            content="<em>No HTML captured for this snapshot.</em>",
+            headers=_SNAPSHOT_RAW_HEADERS,
+        )
+    # Stream in chunks so multi-MB captures never materialize as one
+    # Python string on the way out.
+    return StreamingResponse(
+        iter_snapshot_html(snapshot_id),
+        media_type="text/html",
+        headers=_SNAPSHOT_RAW_HEADERS,
+    )
 
 
 @app.get("/snapshot/{snapshot_id}", response_class=HTMLResponse)
 async def snapshot_view(snapshot_id: int):
-    snap = await get_snapshot_html(snapshot_id)
+    snap = await get_snapshot_meta(snapshot_id)
     if not snap:
         raise HTTPException(404, "Snapshot not found")
     # To avoid executing arbitrary scripts from stored snapshots when a
-    # user opens the snapshot in their browser, serve the captured HTML
-    # inside a sandboxed iframe. We encode the HTML into srcdoc to keep
-    # the snapshot self-contained while preventing script execution.
-    raw_body = snap.get("html") or ("<em>No HTML captured for this snapshot.</em>")
-    import base64
-
-    b64 = base64.b64encode(raw_body.encode("utf-8")).decode("ascii")
-    title = snap.get("title") or "Snapshot"
+    # user opens the snapshot in their browser, embed the raw snapshot
+    # route in a sandboxed iframe. Linking the sibling route avoids
+    # base64-expanding the whole page into a data URL (CPU + 33% bytes).
+    title = snap["title"] or "Snapshot"
     head = (
         "<!doctype html><html><head><meta charset='utf-8'>"
         f"<title>{title}</title>"
         "<meta name=referrer content=no-referrer></head>"
     )
     body_start = "<body style='margin:0;'>"
-    # Use data URL in the iframe src; keep sandbox without 'allow-scripts'
+    # Keep sandbox without 'allow-scripts'
     iframe = (
         "<iframe sandbox='allow-forms' style='border:0;"
         "width:100vw;height:100vh;'"
-        f' src="data:text/html;charset=utf-8;base64,{b64}"></iframe>'
+        f' src="/snapshot/{snapshot_id}/raw"></iframe>'
     )
     wrapper = head + body_start + iframe + "</body></html>"
     return HTMLResponse(wrapper)
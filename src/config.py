@@ -3,6 +3,8 @@
 """
 
 # pyright: reportMissingImports=false
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -29,5 +31,8 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    # Settings() re-reads the environment and .env file; cache so the
+    # pydantic parsing happens exactly once per process.
     return Settings()
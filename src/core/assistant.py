@@ -12,8 +12,9 @@ from __future__ import annotations
 
 import json
 import re
-from datetime import datetime, timedelta
-from typing import Any, Dict, cast
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, cast
 
 try:
     from dateutil import parser as du_parser
@@ -22,20 +23,106 @@ except Exception:  # pragma: no cover - editor/env guard
     du_parser = None  # type: ignore
     relativedelta = None  # type: ignore
 
-import httpx
+from src.core.fetch import get_client
 
 URL_RE = re.compile(r"https?://[^\s]+", re.I)
 DOMAIN_RE = re.compile(r"\b([a-z0-9-]+\.)+[a-z]{2,}\b", re.I)
 DATE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
 YEAR_RE = re.compile(r"\b(19\d{2}|20\d{2})\b")
 
+# Precompiled patterns for everything scanned per message; re.search with
+# string literals re-hits the regex cache on every call.
+_SCHEME_RE = re.compile(r"^https?://", re.I)
+_NOW_RE = re.compile(r"\b(now|today)\b", re.I)
+_YESTERDAY_RE = re.compile(r"\byesterday\b", re.I)
+_SNAPSHOT_RE = re.compile(r"(\d+)\s*(?:snapshots?|points?)", re.I)
+_SINCE_SEG_RE = re.compile(r"\b(since|from)\s+([^,;]+)")
+_UNTIL_SEG_RE = re.compile(r"\buntil\s+([^,;]+)")
+_MID_YEAR_RE = re.compile(r"\bmid\s+(\d{4})\b")
+_QUARTER_END_RE = re.compile(r"\bend of q([1-4])\s+(\d{4})\b")
+
+# All mutually-exclusive relative-date phrases in one alternation so the
+# message is scanned once instead of once per phrase. Longer phrases come
+# before their substrings ("since last year" before "last year").
+_PHRASE_RE = re.compile(
+    r"(?P<since_yesterday>\b(?:since|from)\s+yesterday\b)"
+    r"|(?P<until_yesterday>\buntil\s+yesterday\b)"
+    r"|(?P<since_last_year>\bsince last year\b)"
+    r"|(?P<until_last_year>\buntil last year\b)"
+    r"|(?P<until_last_month>\buntil last month\b)"
+    r"|(?P<last_week>\blast week\b)"
+    r"|(?P<last_month>\blast month\b)"
+    r"|(?P<last_year>\blast year\b)"
+    r"|(?P<yesterday>\byesterday\b)"
+    r"|(?P<now>\b(?:now|today)\b)"
+    r"|(?P<span>\b(?:past|last)\s+(?P<span_n>\d{1,3})\s+"
+    r"(?P<span_unit>years?|months?|weeks?|days?)\b)"
+)
+
+
+def _scan_phrases(ml: str) -> Dict[str, Any]:
+    """Collect relative-date phrase hits in a single pass.
+
+    Returns a dict keyed by phrase name; the "span" entry carries its
+    parsed (n, unit) tuple.
+    """
+    hits: Dict[str, Any] = {}
+    for m in _PHRASE_RE.finditer(ml):
+        if m.group("span"):
+            hits["span"] = (int(m.group("span_n")), m.group("span_unit"))
+        elif m.lastgroup is not None:
+            # Every alternative in _PHRASE_RE is a named group, so
+            # lastgroup is always set; the guard is for the type checker.
+            hits[m.lastgroup] = True
+    return hits
+
+
+# Layouts that cover the overwhelming majority of date fragments users
+# type; trying these first avoids dateutil's costly fuzzy parse.
+_FAST_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%d %b %Y",
+    "%B %d %Y",
+    "%b %d, %Y",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+
+@lru_cache(maxsize=4096)
+def _fast_parse(s: str) -> Optional[datetime]:
+    """Parse a date fragment, common fixed formats first.
+
+    Falls back to dateutil's fuzzy parser only when no fast format
+    matches; cached so repeated fragments become dict lookups.
+    """
+    s = s.strip()
+    for fmt in _FAST_FORMATS:
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    if du_parser is None:
+        return None
+    parsed = du_parser.parse(s, fuzzy=True, default=datetime.utcnow())
+    if isinstance(parsed, tuple):
+        parsed = parsed[0]
+    return cast(datetime, parsed)
+
+
+@lru_cache(maxsize=256)
+def _iso_days_ago_cached(today_ordinal: int, n: int) -> str:
+    return date.fromordinal(today_ordinal - n).isoformat()
+
 
 def _iso_days_ago(n: int) -> str:
-    return (datetime.utcnow().date() - timedelta(days=n)).isoformat()
+    # Keyed on today's ordinal so entries stay valid across midnight;
+    # repeated spans within a day become dict lookups.
+    return _iso_days_ago_cached(datetime.utcnow().toordinal(), n)
 
 
-def _since_span(n: int, unit: str) -> str:
-    unit = unit.lower()
+@lru_cache(maxsize=256)
+def _since_span_cached(today_ordinal: int, n: int, unit: str) -> str:
     if "year" in unit:
         days = 365 * n
     elif "month" in unit:
@@ -44,7 +131,42 @@ def _since_span(n: int, unit: str) -> str:
         days = 7 * n
     else:
         days = 1 * n
-    return _iso_days_ago(days)
+    return _iso_days_ago_cached(today_ordinal, days)
+
+
+def _since_span(n: int, unit: str) -> str:
+    return _since_span_cached(datetime.utcnow().toordinal(), n, unit.lower())
+
+
+def _apply_relative_overrides(
+    merged: Dict[str, Any],
+    ml: str,
+    today: date,
+) -> None:
+    """Apply relative-date phrase overrides to merged slots, in place.
+
+    Shared by the LLM and heuristic-fallback paths of interpret_message,
+    which previously carried duplicated copies of this logic.
+    """
+    hits = _scan_phrases(ml)
+    if not merged.get("since"):
+        if "last_week" in hits:
+            merged["since"] = _iso_days_ago(7)
+        elif "last_month" in hits:
+            merged["since"] = _iso_days_ago(30)
+        elif "last_year" in hits:
+            merged["since"] = _iso_days_ago(365)
+        elif "span" in hits:
+            n, unit = hits["span"]
+            merged["since"] = _since_span(n, unit)
+    if "since_last_year" in hits:
+        merged["since"] = f"{today.year - 1:04d}-01-01"
+    if "until_last_year" in hits:
+        merged["until"] = f"{today.year - 1:04d}-12-31"
+    if "until_last_month" in hits:
+        first_of_month = today.replace(day=1)
+        last_of_prev = first_of_month - timedelta(days=1)
+        merged["until"] = last_of_prev.isoformat()
 
 
 def _normalize_url(u: str | None) -> str | None:
@@ -53,7 +175,7 @@ def _normalize_url(u: str | None) -> str | None:
     ul = u.strip()
     if not ul:
         return None
-    if not re.match(r"^https?://", ul, re.I):
+    if not _SCHEME_RE.match(ul):
         ul = "https://" + ul
     return ul
 
@@ -108,39 +230,35 @@ def _heuristic_extract(message: str) -> Dict[str, Any]:
                 y2 = years[-1]
                 if 1990 <= y2 <= 2100 and y2 >= y1:
                     slots["until"] = f"{y2:04d}-12-31"
-        # Relative phrases
-        if re.search(r"\b(now|today)\b", ml):
+        # Relative phrases (single scan of the message)
+        hits = _scan_phrases(ml)
+        if "now" in hits:
             # leave until open to mean up to current time
             slots.setdefault("until", None)
         # since/from yesterday -> since yesterday; bare 'yesterday' -> until
-        if re.search(r"\b(since|from)\s+yesterday\b", ml):
+        if "since_yesterday" in hits:
             slots["since"] = _iso_days_ago(1)
-        elif re.search(r"\buntil\s+yesterday\b", ml):
-            slots["until"] = _iso_days_ago(1)
-        elif re.search(r"\byesterday\b", ml):
+        elif "until_yesterday" in hits or "yesterday" in hits:
             slots["until"] = _iso_days_ago(1)
         # last week/month/year
-        if re.search(r"\blast week\b", ml):
+        if "last_week" in hits:
             slots.setdefault("since", _iso_days_ago(7))
-        if re.search(r"\blast month\b", ml):
+        if "last_month" in hits:
             slots.setdefault("since", _iso_days_ago(30))
-        if re.search(r"\blast year\b", ml):
+        if "last_year" in hits:
             slots.setdefault("since", _iso_days_ago(365))
         # past/last N years|months|weeks|days
-        span_pat = r"\b(past|last)\s+(\d{1,3})\s+" r"(years?|months?|weeks?|days?)\b"
-        m_span = re.search(span_pat, ml)
-        if m_span:
-            n = int(m_span.group(2))
-            unit = m_span.group(3)
+        if "span" in hits:
+            n, unit = hits["span"]
             slots.setdefault("since", _since_span(n, unit))
         # since last year -> Jan 1 of last year
-        if re.search(r"\bsince last year\b", ml):
+        if "since_last_year" in hits:
             slots["since"] = f"{today.year - 1:04d}-01-01"
         # until last year -> Dec 31 of last year
-        if re.search(r"\buntil last year\b", ml):
+        if "until_last_year" in hits:
             slots["until"] = f"{today.year - 1:04d}-12-31"
         # until last month -> last day of previous month
-        if re.search(r"\buntil last month\b", ml):
+        if "until_last_month" in hits:
             first_of_month = today.replace(day=1)
             last_of_prev = first_of_month - timedelta(days=1)
             slots["until"] = last_of_prev.isoformat()
@@ -153,35 +271,23 @@ def _heuristic_extract(message: str) -> Dict[str, Any]:
                 # skip to avoid conflict
                 if not DATE_RE.search(message):
                     # Try parsing 'since ...' and 'until ...' segments
-                    m_since = re.search(r"\b(since|from)\s+([^,;]+)", ml)
+                    m_since = _SINCE_SEG_RE.search(ml)
                     if m_since and not slots.get("since"):
-                        _parsed = du_parser.parse(
-                            m_since.group(2),
-                            fuzzy=True,
-                            default=datetime.utcnow(),
-                        )
-                        if isinstance(_parsed, tuple):
-                            _parsed = _parsed[0]
-                        dt = cast(datetime, _parsed)
-                        slots["since"] = dt.date().isoformat()
-                    m_until = re.search(r"\buntil\s+([^,;]+)", ml)
+                        dt = _fast_parse(m_since.group(2))
+                        if dt is not None:
+                            slots["since"] = dt.date().isoformat()
+                    m_until = _UNTIL_SEG_RE.search(ml)
                     if m_until and not slots.get("until"):
-                        _parsed2 = du_parser.parse(
-                            m_until.group(1),
-                            fuzzy=True,
-                            default=datetime.utcnow(),
-                        )
-                        if isinstance(_parsed2, tuple):
-                            _parsed2 = _parsed2[0]
-                        dt2 = cast(datetime, _parsed2)
-                        slots["until"] = dt2.date().isoformat()
+                        dt2 = _fast_parse(m_until.group(1))
+                        if dt2 is not None:
+                            slots["until"] = dt2.date().isoformat()
                     # Handle 'mid <year>' as June 15 of that year
-                    m_mid = re.search(r"\bmid\s+(\d{4})\b", ml)
+                    m_mid = _MID_YEAR_RE.search(ml)
                     if m_mid and not slots.get("since"):
                         y = int(m_mid.group(1))
                         slots["since"] = f"{y:04d}-06-15"
                     # 'end of Q2 2023' -> until = 2023-06-30
-                    m_q = re.search(r"\bend of q([1-4])\s+(\d{4})\b", ml)
+                    m_q = _QUARTER_END_RE.search(ml)
                     if m_q and not slots.get("until"):
                         q = int(m_q.group(1))
                         y = int(m_q.group(2))
@@ -203,7 +309,7 @@ def _heuristic_extract(message: str) -> Dict[str, Any]:
         slots["style"] = "llm"
     # snapshots: prefer patterns like "5 snapshots";
     # fallback to presence of 7/5/3
-    m_sn = re.search(r"(\d+)\s*(?:snapshots?|points?)", message, re.I)
+    m_sn = _SNAPSHOT_RE.search(message)
     if m_sn:
         try:
             n = int(m_sn.group(1))
@@ -222,6 +328,56 @@ def _heuristic_extract(message: str) -> Dict[str, Any]:
     return slots
 
 
+def _heuristic_response(
+    message: str,
+    slots: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build a full response from heuristics alone (no LLM)."""
+    extracted = _heuristic_extract(message)
+    merged = _merge_slots(slots, extracted)
+    merged["url"] = _normalize_url(merged.get("url"))
+    if _NOW_RE.search(message):
+        merged["until"] = None
+    elif isinstance(merged.get("until"), str) and merged["until"].strip().lower() in {
+        "now",
+        "today",
+    }:
+        merged["until"] = None
+    if _YESTERDAY_RE.search(message):
+        merged["until"] = (datetime.utcnow().date() - timedelta(days=1)).isoformat()
+    if "snapshots" not in merged:
+        merged["snapshots"] = 5
+    if "style" not in merged:
+        merged["style"] = "llm"
+    # Also handle relative phrases directly in this path
+    _apply_relative_overrides(
+        merged,
+        message.lower(),
+        datetime.utcnow().date(),
+    )
+    reply_parts = ["Got it."]
+    if merged.get("url"):
+        reply_parts.append(f"URL set to {merged['url']}.")
+    if merged.get("since"):
+        reply_parts.append(f"Using since {merged['since']}.")
+    if merged.get("until"):
+        reply_parts.append(f"Using until {merged['until']}.")
+    else:
+        if _NOW_RE.search(message):
+            today = datetime.utcnow().date().isoformat()
+            reply_parts.append(f"Using until {today}.")
+    reply_parts.append(
+        "You can also tell me exact dates like 2024-01-01 and a "
+        "snapshot count (3, 5, or 7)."
+    )
+    reply = " ".join(reply_parts)
+    return {
+        "reply": reply,
+        "slots": merged,
+        "ready": _slots_ready(merged),
+    }
+
+
 def interpret_message(
     message: str,
     slots: Dict[str, Any] | None,
@@ -229,7 +385,9 @@ def interpret_message(
 ) -> Dict[str, Any]:
     """
     Use the local LLM (OpenAI-compatible) to interpret the user's message.
-    Fallback to heuristics if the model isn't available.
+    Skip the LLM entirely when heuristics already fill the slots (the
+    common "URL plus dates" message); fall back to heuristics if the
+    model isn't available.
     """
     system = (
         "You are Mandela for the Mandela Report. You help investigate "
@@ -242,6 +400,12 @@ def interpret_message(
         '"slots": {...}, "ready": bool}.'
     )
     slots = slots or {}
+    # When the message alone yields a URL and at least one concrete
+    # range/count slot, the LLM call is pure latency for no new
+    # information; answer from heuristics directly.
+    probe = _merge_slots(slots, _heuristic_extract(message))
+    if probe.get("url") and any(probe.get(k) for k in ("since", "until", "snapshots")):
+        return _heuristic_response(message, slots)
     try:
         payload = {
             "model": "tinyllama-1.1b-chat",
@@ -259,157 +423,124 @@ def interpret_message(
             ],
             "temperature": 0.2,
             "max_tokens": 300,
+            "stream": True,
         }
-        with httpx.Client(timeout=20.0) as client:
-            r = client.post(f"{base_url}/chat/completions", json=payload)
+        # Stream the completion and stop as soon as the JSON object is
+        # balanced; waiting for the model to finish (and possibly ramble
+        # past the closing brace) adds hundreds of ms of idle wait.
+        buf: list[str] = []
+        depth = 0
+        started = False
+        in_str = False
+        esc = False
+        with get_client().stream(
+            "POST",
+            f"{base_url}/chat/completions",
+            json=payload,
+            timeout=20.0,
+        ) as r:
             r.raise_for_status()
-            data = r.json()
-            content = data["choices"][0]["message"]["content"].strip()
-            # Try to locate JSON in response
-            start = content.find("{")
-            end = content.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                obj = json.loads(content[start : end + 1])
-                merged = _merge_slots(slots, obj.get("slots") or {})
-                # Fill any missing fields using heuristics
-                # (do not override provided ones)
-                heur = _heuristic_extract(message)
-                for k, v in heur.items():
-                    if k not in merged or merged.get(k) in (None, ""):
-                        merged[k] = v
-                # Normalize fields
-                merged["url"] = _normalize_url(merged.get("url"))
-                # If the user's message says 'now' or 'today',
-                # force open-ended until regardless of what the LLM
-                # suggested (prevents stale hard-coded dates).
-                if re.search(r"\b(now|today)\b", message, re.I):
-                    merged["until"] = None
-                elif isinstance(merged.get("until"), str) and merged[
-                    "until"
-                ].strip().lower() in {"now", "today"}:
-                    merged["until"] = None
-                # If the user's message says 'yesterday', use an explicit
-                # date string for clarity in both slots and reply.
-                if re.search(r"\byesterday\b", message, re.I):
-                    merged["until"] = (
-                        datetime.utcnow().date() - timedelta(days=1)
-                    ).isoformat()
-                # defaults
-                if "snapshots" not in merged:
-                    merged["snapshots"] = 5
-                if "style" not in merged:
-                    merged["style"] = "llm"
-                # Additional phrase-based overrides for relative ranges
-                ml = message.lower()
-                tdy = datetime.utcnow().date()
-                if not merged.get("since") and re.search(r"\blast week\b", ml):
-                    merged["since"] = _iso_days_ago(7)
-                if not merged.get("since") and re.search(r"\blast month\b", ml):
-                    merged["since"] = _iso_days_ago(30)
-                if not merged.get("since") and re.search(r"\blast year\b", ml):
-                    merged["since"] = _iso_days_ago(365)
-                span_pat = (
-                    r"\b(past|last)\s+(\d{1,3})\s+" r"(years?|months?|weeks?|days?)\b"
+            for line in r.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                part = line[5:].strip()
+                if part == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(part)
+                    delta = chunk["choices"][0]["delta"].get("content") or ""
+                except Exception:
+                    continue
+                if not delta:
+                    continue
+                buf.append(delta)
+                # Incremental brace balance, skipping braces inside
+                # JSON strings.
+                for ch in delta:
+                    if esc:
+                        esc = False
+                    elif in_str:
+                        if ch == "\\":
+                            esc = True
+                        elif ch == '"':
+                            in_str = False
+                    elif ch == '"':
+                        in_str = True
+                    elif ch == "{":
+                        depth += 1
+                        started = True
+                    elif ch == "}":
+                        depth -= 1
+                if started and depth == 0:
+                    break
+        content = "".join(buf).strip()
+        # Try to locate JSON in response
+        start = content.find("{")
+        end = content.rfind("}")
+        if start != -1 and end != -1 and end > start:
+            obj = json.loads(content[start : end + 1])
+            merged = _merge_slots(slots, obj.get("slots") or {})
+            # Fill any missing fields using heuristics
+            # (do not override provided ones)
+            heur = _heuristic_extract(message)
+            for k, v in heur.items():
+                if k not in merged or merged.get(k) in (None, ""):
+                    merged[k] = v
+            # Normalize fields
+            merged["url"] = _normalize_url(merged.get("url"))
+            # If the user's message says 'now' or 'today',
+            # force open-ended until regardless of what the LLM
+            # suggested (prevents stale hard-coded dates).
+            if _NOW_RE.search(message):
+                merged["until"] = None
+            elif isinstance(merged.get("until"), str) and merged[
+                "until"
+            ].strip().lower() in {"now", "today"}:
+                merged["until"] = None
+            # If the user's message says 'yesterday', use an explicit
+            # date string for clarity in both slots and reply.
+            if _YESTERDAY_RE.search(message):
+                merged["until"] = (
+                    datetime.utcnow().date() - timedelta(days=1)
+                ).isoformat()
+            # defaults
+            if "snapshots" not in merged:
+                merged["snapshots"] = 5
+            if "style" not in merged:
+                merged["style"] = "llm"
+            # Additional phrase-based overrides for relative ranges
+            _apply_relative_overrides(
+                merged,
+                message.lower(),
+                datetime.utcnow().date(),
+            )
+            # Build a fallback reply if the LLM didn't provide one
+            reply = obj.get("reply") or ""
+            if not reply:
+                parts = ["Got it."]
+                if merged.get("url"):
+                    parts.append(f"URL set to {merged['url']}.")
+                if merged.get("since"):
+                    parts.append(f"Using since {merged['since']}.")
+                if merged.get("until"):
+                    parts.append(f"Using until {merged['until']}.")
+                else:
+                    # If user indicated 'now/today', state today's date
+                    # explicitly for clarity
+                    if _NOW_RE.search(message):
+                        today = datetime.utcnow().date().isoformat()
+                        parts.append(f"Using until {today}.")
+                parts.append(
+                    "You can also tell me exact dates like 2024-01-01 and "
+                    "a snapshot count (3, 5, or 7)."
                 )
-                m_span = re.search(span_pat, ml)
-                if not merged.get("since") and m_span:
-                    n = int(m_span.group(2))
-                    unit = m_span.group(3)
-                    merged["since"] = _since_span(n, unit)
-                if re.search(r"\bsince last year\b", ml):
-                    merged["since"] = f"{tdy.year - 1:04d}-01-01"
-                if re.search(r"\buntil last year\b", ml):
-                    merged["until"] = f"{tdy.year - 1:04d}-12-31"
-                if re.search(r"\buntil last month\b", ml):
-                    first_of_month = tdy.replace(day=1)
-                    last_of_prev = first_of_month - timedelta(days=1)
-                    merged["until"] = last_of_prev.isoformat()
-                # Build a fallback reply if the LLM didn't provide one
-                reply = obj.get("reply") or ""
-                if not reply:
-                    parts = ["Got it."]
-                    if merged.get("url"):
-                        parts.append(f"URL set to {merged['url']}.")
-                    if merged.get("since"):
-                        parts.append(f"Using since {merged['since']}.")
-                    if merged.get("until"):
-                        parts.append(f"Using until {merged['until']}.")
-                    else:
-                        # If user indicated 'now/today', state today's date
-                        # explicitly for clarity
-                        if re.search(r"\b(now|today)\b", message, re.I):
-                            today = datetime.utcnow().date().isoformat()
-                            parts.append(f"Using until {today}.")
-                    parts.append(
-                        "You can also tell me exact dates like 2024-01-01 and "
-                        "a snapshot count (3, 5, or 7)."
-                    )
-                    reply = " ".join(parts)
-                return {
-                    "reply": reply,
-                    "slots": merged,
-                    # Consider ready when required fields are present
-                    "ready": _slots_ready(merged),
-                }
-            raise ValueError("No JSON in LLM output")
+                reply = " ".join(parts)
+            return {
+                "reply": reply,
+                "slots": merged,
+                # Consider ready when required fields are present
+                "ready": _slots_ready(merged),
+            }
+        raise ValueError("No JSON in LLM output")
     except Exception:
-        # Heuristic fallback
-        extracted = _heuristic_extract(message)
-        merged = _merge_slots(slots, extracted)
-        merged["url"] = _normalize_url(merged.get("url"))
-        if re.search(r"\b(now|today)\b", message, re.I):
-            merged["until"] = None
-        elif isinstance(merged.get("until"), str) and merged[
-            "until"
-        ].strip().lower() in {"now", "today"}:
-            merged["until"] = None
-        if re.search(r"\byesterday\b", message, re.I):
-            merged["until"] = (datetime.utcnow().date() - timedelta(days=1)).isoformat()
-        if "snapshots" not in merged:
-            merged["snapshots"] = 5
-        if "style" not in merged:
-            merged["style"] = "llm"
-        # Also handle relative phrases directly in fallback path
-        ml = message.lower()
-        tdy = datetime.utcnow().date()
-        if not merged.get("since") and re.search(r"\blast week\b", ml):
-            merged["since"] = _iso_days_ago(7)
-        if not merged.get("since") and re.search(r"\blast month\b", ml):
-            merged["since"] = _iso_days_ago(30)
-        if not merged.get("since") and re.search(r"\blast year\b", ml):
-            merged["since"] = _iso_days_ago(365)
-        span_pat = r"\b(past|last)\s+(\d{1,3})\s+" r"(years?|months?|weeks?|days?)\b"
-        m_span = re.search(span_pat, ml)
-        if not merged.get("since") and m_span:
-            n = int(m_span.group(2))
-            unit = m_span.group(3)
-            merged["since"] = _since_span(n, unit)
-        if re.search(r"\bsince last year\b", ml):
-            merged["since"] = f"{tdy.year - 1:04d}-01-01"
-        if re.search(r"\buntil last year\b", ml):
-            merged["until"] = f"{tdy.year - 1:04d}-12-31"
-        if re.search(r"\buntil last month\b", ml):
-            first_of_month = tdy.replace(day=1)
-            last_of_prev = first_of_month - timedelta(days=1)
-            merged["until"] = last_of_prev.isoformat()
-        reply_parts = ["Got it."]
-        if merged.get("url"):
-            reply_parts.append(f"URL set to {merged['url']}.")
-        if merged.get("since"):
-            reply_parts.append(f"Using since {merged['since']}.")
-        if merged.get("until"):
-            reply_parts.append(f"Using until {merged['until']}.")
-        else:
-            if re.search(r"\b(now|today)\b", message, re.I):
-                today = datetime.utcnow().date().isoformat()
-                reply_parts.append(f"Using until {today}.")
-        reply_parts.append(
-            "You can also tell me exact dates like 2024-01-01 and a "
-            "snapshot count (3, 5, or 7)."
-        )
-        reply = " ".join(reply_parts)
-        return {
-            "reply": reply,
-            "slots": merged,
-            "ready": _slots_ready(merged),
-        }
+        return _heuristic_response(message, slots)
@@ -1,29 +1,89 @@
+# pyright: reportMissingImports=false
 import difflib
 import html
 
+try:
+    from rapidfuzz.distance import Levenshtein  # type: ignore
+except Exception:  # pragma: no cover - runtime fallback
+    Levenshtein = None  # type: ignore
+
+# Optional compiled renderer (Cython/C extension built out-of-tree);
+# same guard pattern as selectolax in extract.py. It must accept
+# (a_words, b_words, opcodes) and return the rendered diff div.
+try:
+    from src.core._diff_fast import render_diff as _render_fast  # type: ignore
+except Exception:  # pragma: no cover - runtime fallback
+    _render_fast = None  # type: ignore
+
 
 def _split_words(text: str):
     return text.split()
 
 
-def diff_texts_html(a: str, b: str) -> str:
-    a_words = _split_words(a)
-    b_words = _split_words(b)
+def _raw_opcodes(a_words, b_words):
+    """Return difflib-style (tag, i1, i2, j1, j2) opcodes for two token
+    lists.
+
+    Uses rapidfuzz's C++ implementation when available (10x+ faster than
+    pure-Python SequenceMatcher on page-sized inputs); falls back to
+    difflib so the project runs without native wheels.
+    """
+    if Levenshtein is not None:
+        return [
+            (op.tag, op.src_start, op.src_end, op.dest_start, op.dest_end)
+            for op in Levenshtein.opcodes(a_words, b_words)
+        ]
     sm = difflib.SequenceMatcher(a=a_words, b=b_words)
+    return sm.get_opcodes()
+
+
+def _opcodes(a_words, b_words):
+    """Opcodes with a cheap linear pre-pass.
+
+    Incremental page edits usually leave long identical head and tail
+    runs; stripping them first shrinks the matcher's superlinear middle
+    workload, often dramatically. The trimmed spans come back as plain
+    "equal" opcodes.
+    """
+    la, lb = len(a_words), len(b_words)
+    limit = min(la, lb)
+    p = 0
+    while p < limit and a_words[p] == b_words[p]:
+        p += 1
+    s = 0
+    while s < limit - p and a_words[la - 1 - s] == b_words[lb - 1 - s]:
+        s += 1
+    mid_ops = _raw_opcodes(a_words[p : la - s], b_words[p : lb - s])
+    ops = []
+    if p:
+        ops.append(("equal", 0, p, 0, p))
+    for tag, i1, i2, j1, j2 in mid_ops:
+        ops.append((tag, i1 + p, i2 + p, j1 + p, j2 + p))
+    if s:
+        ops.append(("equal", la - s, la, lb - s, lb))
+    return ops
+
+
+def _render_html(a_words, b_words, ops) -> str:
+    if _render_fast is not None:
+        return _render_fast(a_words, b_words, ops)
+    # Escape each side once up front; the opcode loop then only slices
+    # and joins instead of re-escaping shared words per opcode.
+    a_esc = list(map(html.escape, a_words))
+    b_esc = list(map(html.escape, b_words))
     out = []
-    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+    for tag, i1, i2, j1, j2 in ops:
         if tag == "equal":
-            seg = " ".join(html.escape(w) for w in b_words[j1:j2])
-            out.append(seg)
+            out.append(" ".join(b_esc[j1:j2]))
         elif tag == "insert":
-            seg = " ".join(html.escape(w) for w in b_words[j1:j2])
+            seg = " ".join(b_esc[j1:j2])
             out.append(f'<ins class="diff-ins">{seg}</ins>')
         elif tag == "delete":
-            seg = " ".join(html.escape(w) for w in a_words[i1:i2])
+            seg = " ".join(a_esc[i1:i2])
             out.append(f'<del class="diff-del">{seg}</del>')
         elif tag == "replace":
-            del_seg = " ".join(html.escape(w) for w in a_words[i1:i2])
-            ins_seg = " ".join(html.escape(w) for w in b_words[j1:j2])
+            del_seg = " ".join(a_esc[i1:i2])
+            ins_seg = " ".join(b_esc[j1:j2])
             out.append(
                 f'<del class="diff-del">{del_seg}</del>'
                 f'<ins class="diff-ins">{ins_seg}</ins>'
@@ -31,6 +91,24 @@ def diff_texts_html(a: str, b: str) -> str:
     return '<div class="diff-body">' + " ".join(out) + "</div>"
 
 
+def _stats(a_words, b_words, ops) -> dict:
+    changed = 0
+    total = max(len(a_words), len(b_words)) or 1
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == "equal":
+            continue
+        # count replaced/deleted/inserted as changed based on b-side span
+        changed += max(j2 - j1, i2 - i1)
+    ratio = min(1.0, max(0.0, changed / total))
+    return {"total_tokens": total, "changed_tokens": changed, "ratio": ratio}
+
+
+def diff_texts_html(a: str, b: str) -> str:
+    a_words = _split_words(a)
+    b_words = _split_words(b)
+    return _render_html(a_words, b_words, _opcodes(a_words, b_words))
+
+
 def diff_change_ratio(a: str, b: str) -> dict:
     """Compute basic change statistics between two texts.
 
@@ -41,13 +119,17 @@ def diff_change_ratio(a: str, b: str) -> dict:
     """
     a_words = _split_words(a)
     b_words = _split_words(b)
-    sm = difflib.SequenceMatcher(a=a_words, b=b_words)
-    changed = 0
-    total = max(len(a_words), len(b_words)) or 1
-    for tag, i1, i2, j1, j2 in sm.get_opcodes():
-        if tag == "equal":
-            continue
-        # count replaced/deleted/inserted as changed based on b-side span
-        changed += max(j2 - j1, i2 - i1)
-    ratio = min(1.0, max(0.0, changed / total))
-    return {"total_tokens": total, "changed_tokens": changed, "ratio": ratio}
+    return _stats(a_words, b_words, _opcodes(a_words, b_words))
+
+
+def diff_both(a: str, b: str) -> tuple:
+    """Render diff HTML and compute stats in one pass.
+
+    Report generation needs both; computing them separately tokenizes
+    and runs the matcher twice on the same inputs, and the matcher is
+    the dominant cost per pair.
+    """
+    a_words = _split_words(a)
+    b_words = _split_words(b)
+    ops = _opcodes(a_words, b_words)
+    return _render_html(a_words, b_words, ops), _stats(a_words, b_words, ops)
@@ -4,6 +4,9 @@ try:
 except Exception:  # pragma: no cover - runtime fallback
     HTMLParser = None  # type: ignore
 
+# Tags whose subtrees never contribute readable text.
+_DROP = ["script", "style", "noscript", "svg", "canvas"]
+
 
 def extract_title_text(html: str):
     """Extract a short title and a textual body from HTML.
@@ -15,9 +18,10 @@ def extract_title_text(html: str):
     if HTMLParser is not None:
         doc = HTMLParser(html)
         title = (doc.css_first("title").text() if doc.css_first("title") else "")[:300]
-        for sel in ["script", "style", "noscript", "svg", "canvas"]:
-            for n in doc.css(sel):
-                n.decompose()
+        # strip_tags removes all drop tags in one C-level DOM pass; the
+        # previous per-selector css()+decompose() loop walked the tree
+        # five times and rebuilt indexes after each removal.
+        doc.strip_tags(_DROP)
         main = (
             doc.css_first("article") or doc.css_first("main") or doc.css_first("body")
         )
@@ -26,7 +30,11 @@ def extract_title_text(html: str):
             if main
             else doc.text(separator=" ", strip=True)
         )
-        return title, text[:80000]
+        # Only copy when the cap actually truncates; slicing an in-bounds
+        # string still allocates a page-sized duplicate.
+        if len(text) > 80000:
+            text = text[:80000]
+        return title, text
 
     # Fallback using BeautifulSoup
     from bs4 import BeautifulSoup  # type: ignore[import]
@@ -34,8 +42,10 @@ def extract_title_text(html: str):
     soup = BeautifulSoup(html, "html5lib")
     title_tag = soup.find("title")
     title = (title_tag.get_text() if title_tag else "")[:300]
-    for tag in soup.find_all(["script", "style", "noscript", "svg", "canvas"]):
+    for tag in soup.find_all(_DROP):
         tag.decompose()
     main = soup.find("article") or soup.find("main") or soup.find("body")
     text = main.get_text(" ", strip=True) if main else soup.get_text(" ", strip=True)
-    return title, text[:80000]
+    if len(text) > 80000:
+        text = text[:80000]
+    return title, text
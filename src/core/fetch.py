@@ -1,11 +1,61 @@
 # pyright: reportMissingImports=false
+import atexit
+import time
 import urllib.robotparser as robotparser
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import httpx
 
+# Shared connection pools. Building a fresh client per call pays a TCP +
+# TLS handshake every time; keep-alive connections amortize that across
+# requests. The sync client is shared with assistant.py / summarize.py.
+_LIMITS = httpx.Limits(max_keepalive_connections=32)
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.Client:
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = httpx.Client(
+            http2=True,
+            timeout=30.0,
+            limits=_LIMITS,
+        )
+        atexit.register(_sync_client.close)
+    return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            follow_redirects=True,
+            limits=_LIMITS,
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """Close the shared async client; called from app shutdown."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+# robots.txt rarely changes; re-fetching it per request added a full
+# network round-trip to every live fetch. Cache parsers per host.
+_ROBOTS_TTL = 3600.0
+_ROBOTS_CACHE: Dict[
+    Tuple[str, str],
+    Tuple[float, robotparser.RobotFileParser],
+] = {}
+
 
 @dataclass
 class LiveFetchResult:
@@ -15,13 +65,53 @@ class LiveFetchResult:
     note: str
 
 
-def _robots_allowed(url: str, ua: str) -> Optional[bool]:
+async def _fetch_robots(
+    scheme: str,
+    netloc: str,
+    ua: str,
+) -> Optional[robotparser.RobotFileParser]:
+    """Fetch and parse robots.txt without blocking the event loop.
+
+    Mirrors RobotFileParser.read() semantics: 401/403 means disallow
+    all, other 4xx means allow all.
+    """
+    robots_url = f"{scheme}://{netloc}/robots.txt"
+    rp = robotparser.RobotFileParser()
+    rp.set_url(robots_url)
+    try:
+        resp = await get_async_client().get(
+            robots_url,
+            headers={"User-Agent": ua},
+            timeout=10.0,
+        )
+    except Exception:
+        return None
+    if resp.status_code in (401, 403):
+        rp.disallow_all = True  # type: ignore[attr-defined]
+    elif 400 <= resp.status_code < 500:
+        rp.allow_all = True  # type: ignore[attr-defined]
+    else:
+        rp.parse(resp.text.splitlines())
+    return rp
+
+
+async def _robots_allowed(url: str, ua: str) -> Optional[bool]:
     try:
         parsed = urlparse(url)
-        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-        rp = robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
+        key = (parsed.scheme, parsed.netloc)
+        now = time.monotonic()
+        cached = _ROBOTS_CACHE.get(key)
+        if cached and now - cached[0] < _ROBOTS_TTL:
+            rp = cached[1]
+        else:
+            fetched = await _fetch_robots(parsed.scheme, parsed.netloc, ua)
+            if fetched is None:
+                # Transient fetch failure (DNS, timeout): deny this one
+                # call but don't cache the failure, or a single blip
+                # would block the host for the whole TTL.
+                return False
+            rp = fetched
+            _ROBOTS_CACHE[key] = (now, rp)
         return rp.can_fetch(ua, url)
     except Exception:
         return False
@@ -35,7 +125,7 @@ async def fetch_live(
     obey_robots: bool,
 ) -> LiveFetchResult:
     if obey_robots:
-        allowed = _robots_allowed(url, ua)
+        allowed = await _robots_allowed(url, ua)
         if not allowed:
             return LiveFetchResult(
                 allowed=False,
@@ -44,13 +134,15 @@ async def fetch_live(
                 note="robots disallow",
             )
     try:
-        async with httpx.AsyncClient(
-            http2=True,
+        client = get_async_client()
+        # Stream so oversize pages are abandoned as soon as the cap
+        # is hit instead of being buffered whole first.
+        async with client.stream(
+            "GET",
+            url,
             headers={"User-Agent": ua},
             timeout=timeout,
-            follow_redirects=True,
-        ) as client:
-            resp = await client.get(url)
+        ) as resp:
             ctype = resp.headers.get("content-type", "")
             if "text/html" not in ctype.lower():
                 return LiveFetchResult(
@@ -59,13 +151,27 @@ async def fetch_live(
                     resp.status_code,
                     "non-HTML content",
                 )
-            if len(resp.content) > max_mb * 1024 * 1024:
+            max_bytes = max_mb * 1024 * 1024
+            declared = resp.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
                 return LiveFetchResult(
                     True,
                     None,
                     resp.status_code,
                     "response too large",
                 )
-            return LiveFetchResult(True, resp.text, resp.status_code, "ok")
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes(65536):
+                buf += chunk
+                if len(buf) > max_bytes:
+                    return LiveFetchResult(
+                        True,
+                        None,
+                        resp.status_code,
+                        "response too large",
+                    )
+            encoding = resp.charset_encoding or "utf-8"
+            text = bytes(buf).decode(encoding, errors="replace")
+            return LiveFetchResult(True, text, resp.status_code, "ok")
     except Exception as e:
         return LiveFetchResult(True, None, None, f"error: {e}")
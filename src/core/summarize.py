@@ -7,7 +7,7 @@ Summary helpers.
 import json
 from typing import Dict, List
 
-import httpx
+from src.core.fetch import get_client
 
 
 def _rule_summary(
@@ -16,7 +16,12 @@ def _rule_summary(
     from_text: str,
     to_text: str,
 ) -> str:
-    delta = len(to_text.split()) - len(from_text.split())
+    # extract_title_text joins tokens with single spaces, so counting
+    # separators gives the word delta without allocating two page-sized
+    # word lists just to take their len().
+    to_words = to_text.count(" ") + 1 if to_text else 0
+    from_words = from_text.count(" ") + 1 if from_text else 0
+    delta = to_words - from_words
     sign = "increased" if delta >= 0 else "decreased"
     spans = ", ".join(
         [f"{p['label']} ({p['from_when']} -> {p['to_when']})" for p in pairs]
@@ -30,6 +35,33 @@ def _rule_summary(
     )
 
 
+# Static prompt parts, built once; the per-call work is then just
+# filling the template. Compact JSON separators also shave tokens sent
+# to (and echoed through) the LLM.
+_SUMMARY_SYSTEM = {
+    "role": "system",
+    "content": (
+        "Be precise, neutral, and helpful. Focus on how "
+        "changes could lead to mismatched public memory "
+        "(Mandela Effects)."
+    ),
+}
+
+_SUMMARY_PROMPT_TEMPLATE = (
+    "You are a concise change analyst. Given two versions of a webpage,\n"
+    "summarize the key changes for a non-technical reader.\n"
+    "Focus on: new/removed sections, wording shifts affecting meaning\n"
+    "(dates, prices, policies), and metadata like titles or disclaimers.\n"
+    "Write 5-10 bullet points and a one-line TL;DR.\n"
+    "URL: {url}\n"
+    "Spans: {spans}\n"
+    "----- BEFORE -----\n"
+    "{before}\n"
+    "----- AFTER -----\n"
+    "{after}\n"
+)
+
+
 def _llm_summary(
     url: str,
     pairs: List[Dict],
@@ -37,41 +69,30 @@ def _llm_summary(
     to_text: str,
     base_url: str,
 ) -> str:
-    prompt = (
-        "You are a concise change analyst. Given two versions of a webpage,\n"
-        "summarize the key changes for a non-technical reader.\n"
-        "Focus on: new/removed sections, wording shifts affecting meaning\n"
-        "(dates, prices, policies), and metadata like titles or disclaimers.\n"
-        "Write 5-10 bullet points and a one-line TL;DR.\n"
-        f"URL: {url}\n"
-        f"Spans: {json.dumps(pairs)}\n"
-        "----- BEFORE -----\n"
-        f"{from_text[:8000]}\n"
-        "----- AFTER -----\n"
-        f"{to_text[:8000]}\n"
+    prompt = _SUMMARY_PROMPT_TEMPLATE.format(
+        url=url,
+        spans=json.dumps(pairs, separators=(",", ":")),
+        before=from_text[:8000],
+        after=to_text[:8000],
     )
     try:
         payload = {
             "model": "tinyllama-1.1b-chat",
             "messages": [
-                {
-                    "role": "system",
-                    "content": (
-                        "Be precise, neutral, and helpful. Focus on how "
-                        "changes could lead to mismatched public memory "
-                        "(Mandela Effects)."
-                    ),
-                },
+                _SUMMARY_SYSTEM,
                 {"role": "user", "content": prompt},
             ],
             "temperature": 0.3,
             "max_tokens": 400,
         }
-        with httpx.Client(timeout=30.0) as client:
-            r = client.post(f"{base_url}/chat/completions", json=payload)
-            r.raise_for_status()
-            data = r.json()
-            return data["choices"][0]["message"]["content"]
+        r = get_client().post(
+            f"{base_url}/chat/completions",
+            json=payload,
+            timeout=30.0,
+        )
+        r.raise_for_status()
+        data = r.json()
+        return data["choices"][0]["message"]["content"]
     except Exception as e:
         return f"(LLM unavailable, fallback to rule-based) {str(e)}"
 
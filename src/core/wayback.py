@@ -3,17 +3,78 @@ Wayback helpers using the Internet Archive CDX API directly.
 """
 
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
+import asyncio
+import atexit
+import hashlib
+import json
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 import requests
 
+from src.core.fetch import get_async_client
+
+# One keep-alive session for all archive.org traffic; a bare
+# requests.get() opens and tears down a TLS connection per call.
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        atexit.register(_session.close)
+    return _session
+
+
+# The CDX API often takes seconds to answer; identical queries repeat
+# constantly while a user iterates on a report, so cache raw responses
+# on disk for a day. Both misses and failures fall through to the
+# network, so the cache is purely best-effort.
+_CDX_CACHE_DIR = Path(".cache/cdx")
+_CDX_TTL = 86400.0
+
+
+def _cdx_cache_get(key: str) -> Optional[Any]:
+    path = _CDX_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime < _CDX_TTL:
+            return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        pass
+    return None
+
+
+def _cdx_cache_set(key: str, data: Any) -> None:
+    try:
+        _CDX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = _CDX_CACHE_DIR / f"{key}.json.tmp"
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(_CDX_CACHE_DIR / f"{key}.json")
+    except Exception:
+        pass
+
 
 def _fmt_cdx_ts(dt: datetime) -> str:
     # CDX expects YYYYMMDDhhmmss
     return dt.strftime("%Y%m%d%H%M%S")
 
 
+def _parse_cdx_ts(s: str) -> datetime:
+    # Fixed-width YYYYMMDDhhmmss; slicing directly skips strptime's
+    # per-call format parsing, which is slow in hot loops.
+    return datetime(
+        int(s[0:4]),
+        int(s[4:6]),
+        int(s[6:8]),
+        int(s[8:10]),
+        int(s[10:12]),
+        int(s[12:14]),
+    )
+
+
 def pick_snapshots(
     url: str,
     since: Optional[datetime],
@@ -32,29 +93,38 @@ def pick_snapshots(
             "fl": "timestamp,original,statuscode",
             "filter": "statuscode:200",
             "collapse": "digest",
-            "limit": "2000",
+            # We only ever pick `count` rows; a generous multiple gives
+            # even spacing enough material without pulling 2000 rows.
+            "limit": str(max(50, count * 20)),
         }
         if since:
             # start of day if time not provided
             params["from"] = _fmt_cdx_ts(since)
         if until:
             params["to"] = _fmt_cdx_ts(until)
+        if since and until and (until - since).days > 5 * 365:
+            # Long ranges: coarsen server-side to one row per
+            # year+month instead of per unique digest.
+            params["collapse"] = "timestamp:6"
 
-        r = requests.get(
-            "https://web.archive.org/cdx/search/cdx",
-            params=params,
-            timeout=20,
-        )
-        r.raise_for_status()
-        data = r.json()
+        key = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        data = _cdx_cache_get(key)
+        if data is None:
+            r = _get_session().get(
+                "https://web.archive.org/cdx/search/cdx",
+                params=params,
+                timeout=20,
+            )
+            r.raise_for_status()
+            data = r.json()
+            _cdx_cache_set(key, data)
         if not data or len(data) <= 1:
             return []
         # first row is header
         rows = data[1:]
-        # Build simple snapshot list with (ts, original)
-        snapshots = [
-            {"ts": row[0], "original": row[1]} for row in rows if len(row) >= 2
-        ]
+        # Plain (ts, original) tuples; dicts per row cost an allocation
+        # and hashing for fields we only read positionally.
+        snapshots = [(row[0], row[1]) for row in rows if len(row) >= 2]
         if not snapshots:
             return []
         # Apply "price is right" endpoints with even distribution:
@@ -70,38 +140,22 @@ def pick_snapshots(
         elif n == 2:
             picks = [snapshots[0], snapshots[-1]]
         else:
-            first_i, last_i = 0, total - 1
-            # Evenly spaced integer indices across [first_i, last_i], inclusive
-            # using floor to avoid going past the last index (price-is-right).
-            idxs = [int(first_i + (last_i - first_i) * k / (n - 1)) for k in range(n)]
-            # Deduplicate while preserving order
-            seen = set()
-            ordered: List[int] = []
-            for i in idxs:
-                if i not in seen:
-                    seen.add(i)
-                    ordered.append(i)
-            # If dedup collapsed (e.g., very small total), backfill from the
-            # end to ensure we still return up to n unique indices including
-            # last.
-            i = last_i
-            while len(ordered) < n and i >= 0:
-                if i not in seen:
-                    seen.add(i)
-                    # Insert before the final element to keep last element at
-                    # end
-                    ordered.insert(-1 if ordered else 0, i)
-                i -= 1
-            picks = [snapshots[i] for i in ordered[:n]]
+            # Evenly spaced indices across [0, total-1] inclusive, using
+            # integer floor division to avoid float rounding edge-cases
+            # and going past the last index (price-is-right). Since
+            # n <= total, the stride is >= 1 so the indices are monotonic
+            # and unique by construction; no dedup/backfill needed.
+            idxs = [(k * (total - 1)) // (n - 1) for k in range(n)]
+            picks = [snapshots[i] for i in idxs]
 
         result: List[Dict] = []
-        for s in picks:
-            ts_iso = datetime.strptime(s["ts"], "%Y%m%d%H%M%S").isoformat()
-            archive_url = f"https://web.archive.org/web/{s['ts']}/{s['original']}"
+        for ts, original in picks:
+            ts_iso = _parse_cdx_ts(ts).isoformat()
+            archive_url = f"https://web.archive.org/web/{ts}/{original}"
             result.append(
                 {
                     "timestamp": ts_iso,
-                    "original": s["original"],
+                    "original": original,
                     "archive_url": archive_url,
                 }
             )
@@ -111,6 +165,54 @@ def pick_snapshots(
 
 
 def fetch_archive_html(archive_url: str, ua: str) -> str:
-    r = requests.get(archive_url, headers={"User-Agent": ua}, timeout=20)
+    r = _get_session().get(archive_url, headers={"User-Agent": ua}, timeout=20)
     r.raise_for_status()
     return r.text
+
+
+async def fetch_archive_html_async(
+    archive_url: str,
+    ua: str,
+    retries: int = 2,
+) -> str:
+    """Fetch one archived page on the shared async client.
+
+    Wayback serves intermittent 5xx under load; retry those a couple of
+    times with exponential backoff before giving up.
+    """
+    client = get_async_client()
+    delay = 1.0
+    for attempt in range(retries + 1):
+        r = await client.get(
+            archive_url,
+            headers={"User-Agent": ua},
+            timeout=20,
+        )
+        if r.status_code >= 500 and attempt < retries:
+            await asyncio.sleep(delay)
+            delay *= 2
+            continue
+        r.raise_for_status()
+        return r.text
+    raise RuntimeError("unreachable")
+
+
+async def fetch_all_archives(
+    snapshots: List[Dict],
+    ua: str,
+) -> List[Optional[str]]:
+    """Fetch every snapshot's HTML concurrently, bounded to 5 in flight.
+
+    Returns one entry per input snapshot, None where the fetch failed,
+    so callers can zip results back against their metadata.
+    """
+    sem = asyncio.Semaphore(5)
+
+    async def one(meta: Dict) -> Optional[str]:
+        async with sem:
+            try:
+                return await fetch_archive_html_async(meta["archive_url"], ua)
+            except Exception:
+                return None
+
+    return list(await asyncio.gather(*(one(m) for m in snapshots)))
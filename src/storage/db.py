@@ -1,23 +1,290 @@
 # pyright: reportMissingImports=false
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Callable, List, Optional
 
 import aiosqlite
 
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover - runtime fallback
+    zstandard = None  # type: ignore
+
 DB_PATH = "data/mandelareport.sqlite3"
 
+# Applied once per pooled connection; connections are long-lived so the
+# cost is paid at pool warm-up, not per query.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Hot statements as module constants: sqlite3's per-connection statement
+# cache is keyed on the SQL string, so reusing the same object on a
+# long-lived connection skips parse/plan on every call after the first.
+SQL_INSERT_REPORT = "INSERT INTO reports (id, url, created_at) VALUES (?, ?, ?)"
+SQL_SELECT_REPORT = "SELECT id, url, created_at FROM reports WHERE id=?"
+SQL_SELECT_REPORTS_BY_IDS = (
+    "SELECT r.id, r.url, r.created_at FROM reports r "
+    "JOIN json_each(?) j ON r.id = j.value"
+)
+SQL_INSERT_SNAPSHOT = (
+    'INSERT INTO snapshots (report_id, source, "when", url, title, text) '
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_INSERT_SNAPSHOT_HTML = (
+    "INSERT INTO snapshot_html (snapshot_id, html, compressor) " "VALUES (?, ?, ?)"
+)
+SQL_SELECT_SNAPSHOTS = (
+    'SELECT id, source, "when", url, title, text FROM snapshots '
+    'WHERE report_id=? ORDER BY "when" ASC'
+)
+SQL_SELECT_SNAPSHOT_HTML = (
+    'SELECT s.id, s.source, s."when", s.url, s.title, h.html, h.compressor '
+    "FROM snapshots s LEFT JOIN snapshot_html h ON h.snapshot_id = s.id "
+    "WHERE s.id=?"
+)
+SQL_SELECT_SNAPSHOT_META = (
+    'SELECT s.id, s.source, s."when", s.url, s.title, '
+    "length(h.html) AS html_len "
+    "FROM snapshots s LEFT JOIN snapshot_html h ON h.snapshot_id = s.id "
+    "WHERE s.id=?"
+)
+# OR IGNORE + the unique (report_id, label) index make the legacy-report
+# backfill idempotent: two concurrent first views both compute the
+# diffs, but only one set of rows lands.
+SQL_INSERT_REPORT_DIFF = (
+    "INSERT OR IGNORE INTO report_diffs "
+    "(report_id, label, from_when, to_when, html, ratio) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_SELECT_REPORT_DIFFS = (
+    "SELECT label, from_when, to_when, html, ratio FROM report_diffs "
+    "WHERE report_id=?"
+)
+SQL_DELETE_OLD_REPORTS = "DELETE FROM reports WHERE created_at < ?"
+
+
+async def _connection_factory() -> aiosqlite.Connection:
+    # check_same_thread=False lets iter_snapshot_html reach the raw
+    # sqlite3 connection for incremental blob reads from a worker
+    # thread; SQLite itself is compiled threadsafe.
+    db = await aiosqlite.connect(
+        DB_PATH,
+        cached_statements=256,
+        check_same_thread=False,
+    )
+    # Row supports row["key"] access without allocating a dict with
+    # hashed string keys per row, which dominates for small rows.
+    db.row_factory = aiosqlite.Row
+    for pragma in _PRAGMAS:
+        await db.execute(pragma)
+    return db
+
+
+# Subset safe for read-only handles: journal_mode is a sticky property
+# of the database file (set by the writer) and cannot be changed on a
+# mode=ro connection.
+_READER_PRAGMAS = (
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+async def _reader_factory() -> aiosqlite.Connection:
+    # mode=ro has SQLite itself enforce that readers never take the
+    # write lock; WAL lets them run concurrently with the single writer.
+    db = await aiosqlite.connect(
+        f"file:{DB_PATH}?mode=ro",
+        uri=True,
+        cached_statements=256,
+        check_same_thread=False,
+    )
+    db.row_factory = aiosqlite.Row
+    for pragma in _READER_PRAGMAS:
+        await db.execute(pragma)
+    return db
+
+
+class SQLiteConnectionPool:
+    """Small pool of long-lived aiosqlite connections.
+
+    Opening a connection per query pays a thread spawn, file open and
+    PRAGMA setup every time; reusing warm connections keeps SQLite's page
+    cache hot across requests.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable,
+        size: int = 4,
+    ):
+        self._factory = connection_factory
+        self._size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._opened = 0
+        self._open_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def _acquire(self) -> aiosqlite.Connection:
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        async with self._open_lock:
+            if self._opened < self._size:
+                conn = await self._factory()
+                self._opened += 1
+                return conn
+        # Pool exhausted: wait for a connection to be released
+        return await self._idle.get()
+
+    async def close(self) -> None:
+        while self._opened:
+            conn = await self._idle.get()
+            await conn.close()
+            self._opened -= 1
+
+
+_pool: Optional[SQLiteConnectionPool] = None
+_writer: Optional[aiosqlite.Connection] = None
+_writer_lock = asyncio.Lock()
+
+
+def get_pool() -> SQLiteConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = SQLiteConnectionPool(
+            _reader_factory,
+            size=os.cpu_count() or 4,
+        )
+    return _pool
+
+
+@asynccontextmanager
+async def writer():
+    """Acquire the single shared write connection.
+
+    SQLite serializes writers anyway; funnelling all writes through one
+    connection under a lock avoids SQLITE_BUSY churn while reads stay
+    concurrent on the reader pool.
+    """
+    global _writer
+    async with _writer_lock:
+        if _writer is None:
+            _writer = await _connection_factory()
+        yield _writer
+
+
+async def close_pool() -> None:
+    global _initialized, _pool, _writer
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+    if _writer is not None:
+        await _writer.close()
+        _writer = None
+    # A later startup may point at a different DB_PATH (tests do);
+    # force the next init_db to run the schema pass again.
+    _initialized = False
+
+
+_initialized = False
+_init_lock = asyncio.Lock()
+
 
 async def init_db():
-    async with aiosqlite.connect(DB_PATH) as db:
+    # DDL is idempotent but not free: four parses plus a commit per
+    # call. Gate behind a flag (under a lock, so concurrent startup
+    # callers wait for the first run) and make warm calls no-ops.
+    global _initialized
+    if _initialized:
+        return
+    async with _init_lock:
+        if _initialized:
+            return
+        await _init_schema()
+        _initialized = True
+
+
+async def _init_schema():
+    async with writer() as db:
+        # auto_vacuum lets incremental_vacuum reclaim freed pages in
+        # small slices, but it is baked into the database header, which
+        # already exists by the time we get a connection — switching it
+        # on requires one VACUUM. That is a one-time migration cost,
+        # trivial on a new database.
+        cur = await db.execute("PRAGMA auto_vacuum")
+        row = await cur.fetchone()
+        if row and row[0] != 2:
+            await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            await db.execute("VACUUM")
         await db.execute(
             """
         CREATE TABLE IF NOT EXISTS reports (
             id TEXT PRIMARY KEY,
             url TEXT NOT NULL,
-            created_at TEXT NOT NULL
+            created_at INTEGER NOT NULL
         )
         """
         )
+        # One-shot migration for databases whose reports table declared
+        # created_at TEXT: the declaration survives CREATE IF NOT
+        # EXISTS, and TEXT affinity would coerce epoch-ms integers
+        # straight back to strings on every insert, so an in-place
+        # UPDATE cannot fix it — the table itself has to be rebuilt
+        # with the INTEGER column, converting stored ISO strings on the
+        # copy. Foreign keys go off around the DROP so cascading child
+        # tables (on already-migrated schemas) aren't emptied with it;
+        # the PRAGMA is a no-op inside a transaction, hence the commits.
+        cur = await db.execute(
+            "SELECT type FROM pragma_table_info('reports') " "WHERE name='created_at'"
+        )
+        row = await cur.fetchone()
+        if row and row[0].upper() != "INTEGER":
+            await db.commit()
+            await db.execute("PRAGMA foreign_keys=OFF")
+            await db.execute(
+                """
+        CREATE TABLE reports_migrate (
+            id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+        """
+            )
+            await db.execute(
+                "INSERT INTO reports_migrate SELECT id, url, "
+                "CASE typeof(created_at) WHEN 'text' THEN "
+                "CAST(strftime('%s', created_at) AS INTEGER) * 1000 "
+                "ELSE created_at END FROM reports"
+            )
+            await db.execute("DROP TABLE reports")
+            await db.execute("ALTER TABLE reports_migrate RENAME TO reports")
+            await db.commit()
+            await db.execute("PRAGMA foreign_keys=ON")
+        # Child tables cascade from reports so retention is a single
+        # DELETE. SQLite's ALTER TABLE cannot add foreign keys, so a
+        # pre-FK snapshots table is rebuilt below once snapshot_html
+        # exists; CREATE IF NOT EXISTS alone won't change it.
         await db.execute(
             """
         CREATE TABLE IF NOT EXISTS snapshots (
@@ -28,39 +295,243 @@ async def init_db():
             url TEXT NOT NULL,
             title TEXT,
             text TEXT,
-            html TEXT
+            FOREIGN KEY(report_id) REFERENCES reports(id) ON DELETE CASCADE
         )
         """
         )
+        # Raw page HTML (potentially megabytes per row) lives in its own
+        # table so scans of snapshots — list_snapshots touches every row
+        # of a report — read narrow rows instead of stepping over pages
+        # of markup.
         await db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_snap_report ON " "snapshots(report_id)"
+            """
+        CREATE TABLE IF NOT EXISTS snapshot_html (
+            snapshot_id INTEGER PRIMARY KEY
+                REFERENCES snapshots(id) ON DELETE CASCADE,
+            html BLOB,
+            compressor INTEGER NOT NULL DEFAULT 0
+        )
+        """
+        )
+        # Column migration for databases created before compression;
+        # SQLite has no ADD COLUMN IF NOT EXISTS.
+        try:
+            await db.execute(
+                "ALTER TABLE snapshot_html ADD COLUMN "
+                "compressor INTEGER NOT NULL DEFAULT 0"
+            )
+        except Exception:
+            pass
+        # One-shot migration for pre-split / pre-FK snapshots tables:
+        # move legacy html values into snapshot_html (as raw blobs —
+        # compressor 0 — so existing readers keep working), then rebuild
+        # snapshots without the html column and with the ON DELETE
+        # CASCADE clause the single-statement purge relies on. Either
+        # symptom forces the rebuild. Same foreign_keys/commit dance as
+        # the reports rebuild above.
+        cur = await db.execute(
+            "SELECT "
+            "(SELECT COUNT(*) FROM pragma_table_info('snapshots') "
+            "WHERE name='html'), "
+            "(SELECT COUNT(*) FROM pragma_foreign_key_list('snapshots'))"
+        )
+        has_html_col, has_fk = await cur.fetchone()
+        if has_html_col or not has_fk:
+            await db.commit()
+            await db.execute("PRAGMA foreign_keys=OFF")
+            if has_html_col:
+                await db.execute(
+                    "INSERT OR IGNORE INTO snapshot_html "
+                    "(snapshot_id, html, compressor) "
+                    "SELECT id, CAST(html AS BLOB), 0 FROM snapshots "
+                    "WHERE html IS NOT NULL"
+                )
+            await db.execute(
+                """
+        CREATE TABLE snapshots_migrate (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            report_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            "when" TEXT NOT NULL,
+            url TEXT NOT NULL,
+            title TEXT,
+            text TEXT,
+            FOREIGN KEY(report_id) REFERENCES reports(id) ON DELETE CASCADE
+        )
+        """
+            )
+            await db.execute(
+                "INSERT INTO snapshots_migrate "
+                '(id, report_id, source, "when", url, title, text) '
+                'SELECT id, report_id, source, "when", url, title, text '
+                "FROM snapshots"
+            )
+            await db.execute("DROP TABLE snapshots")
+            await db.execute("ALTER TABLE snapshots_migrate RENAME TO snapshots")
+            await db.commit()
+            await db.execute("PRAGMA foreign_keys=ON")
+        # Rendered diff HTML is write-once per report; caching it here
+        # lets /report/{id} skip re-running difflib on every view.
+        await db.execute(
+            """
+        CREATE TABLE IF NOT EXISTS report_diffs (
+            report_id TEXT NOT NULL,
+            label TEXT NOT NULL,
+            from_when TEXT,
+            to_when TEXT,
+            html TEXT,
+            ratio REAL,
+            FOREIGN KEY(report_id) REFERENCES reports(id) ON DELETE CASCADE
+        )
+        """
+        )
+        # Composite index serves list_snapshots' ORDER BY "when" without
+        # a separate sort step (EXPLAIN QUERY PLAN: SEARCH snapshots
+        # USING INDEX idx_snap_report_when, no temp b-tree). We stop
+        # short of a fully covering index: the SELECT includes text, and
+        # duplicating the page text into the index would roughly double
+        # table storage for rows the range scan already reads in "when"
+        # order.
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snap_report_when ON "
+            'snapshots(report_id, "when")'
+        )
+        await db.execute("DROP INDEX IF EXISTS idx_snap_report")
+        # One diff row per (report_id, label); the unique index backs
+        # the INSERT OR IGNORE that keeps concurrent legacy backfills
+        # from doubling rows, and serves the report_id lookup that the
+        # plain index used to. Existing databases may already hold
+        # duplicates from the race, so dedupe before creating it.
+        await db.execute(
+            "DELETE FROM report_diffs WHERE rowid NOT IN "
+            "(SELECT MIN(rowid) FROM report_diffs "
+            "GROUP BY report_id, label)"
+        )
+        # New name: IF NOT EXISTS keyed on the old one would leave the
+        # non-unique index in place on existing databases.
+        await db.execute("DROP INDEX IF EXISTS idx_report_diffs_report")
+        await db.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_report_diffs_label "
+            "ON report_diffs(report_id, label)"
+        )
+        # Retention purge filters on created_at; a range scan beats a
+        # full table scan once reports accumulate.
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reports_created ON " "reports(created_at)"
         )
         await db.commit()
 
 
+def created_at_iso(ms: int) -> str:
+    """Format an epoch-ms created_at for display; storage stays integer."""
+    return datetime.utcfromtimestamp(ms / 1000).isoformat()
+
+
 async def create_report(report_id: str, url: str):
-    # Use a consistent ISO8601 UTC timestamp for created_at so all code
-    # compares timestamps using the same format (Python-serialised). The
-    # SQLite datetime('now') format differs (no 'T'), which made string
-    # comparisons unreliable in purge_old_reports.
-    now = datetime.utcnow().isoformat()
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute(
-            "INSERT INTO reports (id, url, created_at) VALUES " "(?, ?, ?)",
-            (report_id, url, now),
-        )
+    # Epoch milliseconds: integer comparisons in the purge range scan,
+    # no datetime/strftime allocation per insert, and immune to the
+    # ISO-vs-datetime('now') format mismatches string compares had.
+    now = time.time_ns() // 1_000_000
+    async with writer() as db:
+        await db.execute(SQL_INSERT_REPORT, (report_id, url, now))
         await db.commit()
 
 
-async def get_report(report_id: str) -> Optional[Dict[str, Any]]:
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute(
-            "SELECT id, url, created_at FROM reports WHERE id=?", (report_id,)
-        ) as cur:
-            row = await cur.fetchone()
-            if not row:
-                return None
-            return {"id": row[0], "url": row[1], "created_at": row[2]}
+async def get_report(report_id: str) -> Optional[aiosqlite.Row]:
+    async with get_pool().connection() as db:
+        # execute_fetchall runs execute + fetch + close in one hop to
+        # aiosqlite's worker thread; the execute/fetchone/close dance
+        # costs three queue round-trips for a microsecond query.
+        rows = await db.execute_fetchall(SQL_SELECT_REPORT, (report_id,))
+        return rows[0] if rows else None
+
+
+async def get_reports(ids: List[str]) -> List[aiosqlite.Row]:
+    """Fetch many reports in a single statement.
+
+    Joining against json_each sidesteps both the one-SELECT-per-id
+    pattern and the 999-parameter cap a literal IN (?,?,...) list would
+    hit; json1 is built into every modern SQLite.
+    """
+    if not ids:
+        return []
+    async with get_pool().connection() as db:
+        return list(
+            await db.execute_fetchall(
+                SQL_SELECT_REPORTS_BY_IDS,
+                (json.dumps(ids),),
+            )
+        )
+
+
+# Background HTML writer. Snapshot metadata (the narrow columns the
+# diff path reads back right away) commits synchronously; the multi-MB
+# HTML payloads are enqueued as (snapshot_id, html) pairs and a single
+# task drains the queue, folding pairs that arrive within one short
+# window into one compress + commit, so the request path pays memcpy
+# cost for the HTML instead of compression + disk I/O. Durability
+# trade-off: pairs still queued or in the in-flight batch are lost on a
+# crash — at most one batch window of HTML — consistent with the
+# WAL + synchronous=NORMAL posture already taken above.
+_WRITE_Q: asyncio.Queue = asyncio.Queue(maxsize=1024)
+_WRITE_BATCH_MAX = 64
+_WRITE_BATCH_WINDOW = 0.05  # seconds
+_write_task: Optional[asyncio.Task] = None
+
+
+async def _writer_loop() -> None:
+    while True:
+        pairs = [await _WRITE_Q.get()]
+        deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+        while len(pairs) < _WRITE_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pairs.append(await asyncio.wait_for(_WRITE_Q.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        try:
+            async with writer() as db:
+                await _insert_html_rows(db, pairs)
+                await db.commit()
+        except Exception:
+            # A bad batch (e.g. FK violation on a purged report) must
+            # not take the writer down for everything queued behind it.
+            pass
+        finally:
+            for _ in pairs:
+                _WRITE_Q.task_done()
+
+
+def start_write_queue() -> None:
+    """Spawn the background HTML writer; called from app startup."""
+    global _write_task
+    if _write_task is None or _write_task.done():
+        _write_task = asyncio.create_task(_writer_loop())
+
+
+def _write_queue_running() -> bool:
+    return _write_task is not None and not _write_task.done()
+
+
+async def flush_writes() -> None:
+    """Block until every queued HTML payload has been committed."""
+    await _WRITE_Q.join()
+
+
+async def stop_write_queue() -> None:
+    """Flush pending rows and stop the writer; called from app shutdown."""
+    global _write_task
+    if _write_task is None:
+        return
+    await flush_writes()
+    _write_task.cancel()
+    try:
+        await _write_task
+    except asyncio.CancelledError:
+        pass
+    _write_task = None
 
 
 async def save_snapshot(
@@ -72,61 +543,234 @@ async def save_snapshot(
     text: str,
     html: str,
 ):
-    async with aiosqlite.connect(DB_PATH) as db:
+    """Insert a single snapshot; thin wrapper over save_snapshots."""
+    await save_snapshots([(report_id, source, when, url, title, text, html)])
+
+
+# Stored-HTML codecs. Snapshots of the same site repeat enormous
+# boilerplate, so compressing the payload cuts disk bytes (and the I/O
+# behind every read) several-fold. zstd is preferred when installed;
+# stdlib zlib otherwise. Each row records its codec so the choice can
+# rotate without rewriting history, and raw rows (0) from older
+# databases keep working.
+_COMP_RAW = 0
+_COMP_ZLIB = 1
+_COMP_ZSTD = 2
+
+
+def _compress_html(data: bytes) -> tuple:
+    if zstandard is not None:
+        return _COMP_ZSTD, zstandard.ZstdCompressor(level=3).compress(data)
+    return _COMP_ZLIB, zlib.compress(data, 1)
+
+
+def _decompress_fn(compressor: int):
+    """Incremental decompress callable for a codec id; None for raw."""
+    if compressor == _COMP_ZLIB:
+        return zlib.decompressobj().decompress
+    if compressor == _COMP_ZSTD:
+        if zstandard is None:
+            raise RuntimeError(
+                "snapshot was stored with zstd; install zstandard to read it"
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress
+    return None
+
+
+async def save_snapshots(rows: List[tuple]) -> None:
+    """Insert many snapshots in a single transaction.
+
+    Batching the per-snapshot inserts of one report collapses N commits
+    (one fsync each) into a single commit.
+    """
+    if not rows:
+        return
+    async with writer() as db:
+        pairs = await _insert_snapshot_rows(db, rows)
+        await _insert_html_rows(db, pairs)
+        await db.commit()
+
+
+async def _insert_snapshot_rows(
+    db: aiosqlite.Connection,
+    rows: List[tuple],
+) -> List[tuple]:
+    # Row-at-a-time inserts (to pick up last_insert_rowid for the
+    # html sibling) but within the caller's transaction, so one fsync;
+    # the statement cache serves the repeated INSERTs. Returns the
+    # (snapshot_id, html) pairs for the caller to write inline or hand
+    # to the background queue.
+    pairs = []
+    for row in rows:
+        cur = await db.execute(SQL_INSERT_SNAPSHOT, row[:6])
+        pairs.append((cur.lastrowid, row[6]))
+    return pairs
+
+
+async def _insert_html_rows(db: aiosqlite.Connection, pairs: List[tuple]):
+    for snapshot_id, html in pairs:
+        if isinstance(html, str):
+            # Stored as a real BLOB so readers can use incremental
+            # blob I/O instead of materializing the whole value.
+            html = html.encode("utf-8")
+        comp, payload = _compress_html(html)
         await db.execute(
-            """
-            INSERT INTO snapshots (report_id, source, "when", url, title, text,
-                                   html)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-            (report_id, source, when, url, title, text, html),
+            SQL_INSERT_SNAPSHOT_HTML,
+            (snapshot_id, payload, comp),
         )
-        await db.commit()
 
 
-async def list_snapshots(report_id: str) -> List[Dict[str, Any]]:
-    async with aiosqlite.connect(DB_PATH) as db:
-        rows = []
-        async with db.execute(
-            'SELECT id, source, "when", url, title, text FROM snapshots '
-            'WHERE report_id=? ORDER BY "when" ASC',
-            (report_id,),
-        ) as cur:
-            async for r in cur:
-                rows.append(
-                    {
-                        "id": r[0],
-                        "source": r[1],
-                        "when": r[2],
-                        "url": r[3],
-                        "title": r[4],
-                        "text": r[5],
-                    }
-                )
-        return rows
+async def create_report_with_snapshots(
+    report_id: str,
+    url: str,
+    rows: List[tuple],
+) -> None:
+    """Insert a report and all of its snapshots in one transaction.
+
+    Report creation and ingest always happen back-to-back; doing them in
+    one BEGIN IMMEDIATE...COMMIT means one fsync and one trip through
+    the write-lock queue instead of two. When the background writer is
+    running, the HTML payloads are handed to it instead of being
+    compressed and written here, so the caller's transaction carries
+    only the narrow rows it reads back immediately.
+    """
+    now = time.time_ns() // 1_000_000
+    queue_html = _write_queue_running()
+    async with writer() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            await db.execute(SQL_INSERT_REPORT, (report_id, url, now))
+            pairs = await _insert_snapshot_rows(db, rows)
+            if not queue_html:
+                await _insert_html_rows(db, pairs)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    if queue_html:
+        for pair in pairs:
+            await _WRITE_Q.put(pair)
+
+
+async def list_snapshots(report_id: str) -> List[aiosqlite.Row]:
+    async with get_pool().connection() as db:
+        return list(await db.execute_fetchall(SQL_SELECT_SNAPSHOTS, (report_id,)))
 
 
-async def get_snapshot_html(snapshot_id: int) -> Optional[Dict[str, Any]]:
+async def get_snapshot_html(snapshot_id: int) -> Optional[dict]:
     """Return minimal snapshot info with stored HTML for inline viewing."""
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute(
-            (
-                'SELECT id, source, "when", url, title, html '
-                "FROM snapshots WHERE id=?"
-            ),
+    # A view can race the background HTML writer right after report
+    # creation; draining the queue first is free once it's empty.
+    await flush_writes()
+    async with get_pool().connection() as db:
+        rows = await db.execute_fetchall(
+            SQL_SELECT_SNAPSHOT_HTML,
             (snapshot_id,),
-        ) as cur:
-            row = await cur.fetchone()
-            if not row:
-                return None
-            return {
-                "id": row[0],
-                "source": row[1],
-                "when": row[2],
-                "url": row[3],
-                "title": row[4],
-                "html": row[5],
-            }
+        )
+        if not rows:
+            return None
+        out = dict(rows[0])
+        decompress = _decompress_fn(out.pop("compressor") or _COMP_RAW)
+        if decompress is not None and out["html"] is not None:
+            out["html"] = decompress(out["html"])
+        if isinstance(out["html"], bytes):
+            out["html"] = out["html"].decode("utf-8", errors="replace")
+        return out
+
+
+async def save_report_diffs(report_id: str, rows: List[tuple]) -> None:
+    """Persist rendered diff rows (label, from_when, to_when, html, ratio)."""
+    if not rows:
+        return
+    async with writer() as db:
+        await db.executemany(
+            SQL_INSERT_REPORT_DIFF,
+            [(report_id, *r) for r in rows],
+        )
+        await db.commit()
+
+
+async def list_report_diffs(report_id: str) -> List[aiosqlite.Row]:
+    async with get_pool().connection() as db:
+        return list(await db.execute_fetchall(SQL_SELECT_REPORT_DIFFS, (report_id,)))
+
+
+async def get_snapshot_meta(snapshot_id: int) -> Optional[aiosqlite.Row]:
+    """Return snapshot info without pulling the stored HTML into memory.
+
+    html_len is NULL when no HTML row exists for the snapshot.
+    """
+    await flush_writes()
+    async with get_pool().connection() as db:
+        rows = await db.execute_fetchall(
+            SQL_SELECT_SNAPSHOT_META,
+            (snapshot_id,),
+        )
+        return rows[0] if rows else None
+
+
+def _read_blob_chunk(
+    conn: sqlite3.Connection,
+    snapshot_id: int,
+    offset: int,
+    length: int,
+) -> Optional[bytes]:
+    try:
+        blob = conn.blobopen(
+            "snapshot_html",
+            "html",
+            snapshot_id,
+            readonly=True,
+        )
+    except sqlite3.OperationalError:
+        # no such rowid, or value is not a blob (pre-migration row)
+        return None
+    try:
+        if offset >= len(blob):
+            return b""
+        blob.seek(offset)
+        return blob.read(length)
+    finally:
+        blob.close()
+
+
+async def iter_snapshot_html(snapshot_id: int, chunk_size: int = 65536):
+    """Yield the stored HTML in chunks without materializing it whole.
+
+    Incremental blob I/O reads chunk_size bytes straight off the pages
+    holding the value — substr() would have SQLite load the entire blob
+    to evaluate it — so peak memory stays at one chunk regardless of
+    page size. Compressed rows are inflated chunk-by-chunk through a
+    streaming decompressor. The connection is re-acquired per chunk so
+    a slow client doesn't pin a pooled reader.
+    """
+    await flush_writes()
+    async with get_pool().connection() as db:
+        rows = await db.execute_fetchall(
+            "SELECT compressor FROM snapshot_html WHERE snapshot_id=?",
+            (snapshot_id,),
+        )
+    if not rows:
+        return
+    decompress = _decompress_fn(rows[0][0] or _COMP_RAW)
+    offset = 0
+    while True:
+        async with get_pool().connection() as db:
+            chunk = await asyncio.to_thread(
+                _read_blob_chunk,
+                db._conn,
+                snapshot_id,
+                offset,
+                chunk_size,
+            )
+        if not chunk:
+            break
+        out = decompress(chunk) if decompress is not None else chunk
+        if out:
+            yield out
+        if len(chunk) < chunk_size:
+            break
+        offset += chunk_size
 
 
 async def purge_old_reports(retention_days: int) -> int:
@@ -134,29 +778,32 @@ async def purge_old_reports(retention_days: int) -> int:
     Delete reports (and their snapshots) older than the retention window.
     Returns number of reports deleted.
     """
-    cutoff = datetime.utcnow() - timedelta(days=retention_days)
-    cutoff_iso = cutoff.isoformat()
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Find report ids to delete
-        ids: List[str] = []
-        async with db.execute(
-            "SELECT id FROM reports WHERE created_at < ?", (cutoff_iso,)
-        ) as cur:
-            async for r in cur:
-                ids.append(r[0])
-        if not ids:
-            return 0
-        # Delete snapshots then reports
-        await db.executemany(
-            "DELETE FROM snapshots WHERE report_id = ?", [(i,) for i in ids]
-        )
-        await db.executemany("DELETE FROM reports WHERE id = ?", [(i,) for i in ids])
+    cutoff_ms = int((time.time() - retention_days * 86400) * 1000)
+    async with writer() as db:
+        # ON DELETE CASCADE removes snapshots and cached diffs along
+        # with their reports, so retention is one statement and one
+        # fsync.
+        cur = await db.execute(SQL_DELETE_OLD_REPORTS, (cutoff_ms,))
+        deleted = cur.rowcount
         await db.commit()
-        return len(ids)
+        return deleted
 
 
 async def vacuum() -> None:
-    """Run VACUUM to reclaim space after large deletions."""
-    async with aiosqlite.connect(DB_PATH) as db:
+    """Reclaim space after deletions without blocking readers.
+
+    incremental_vacuum returns freed pages to the OS in small slices and
+    the checkpoint truncates the WAL, unlike a full VACUUM which rewrites
+    the whole database under an exclusive lock.
+    """
+    async with writer() as db:
+        await db.execute("PRAGMA incremental_vacuum")
+        await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        await db.commit()
+
+
+async def full_vacuum() -> None:
+    """Full VACUUM rewrite; only for offline maintenance windows."""
+    async with writer() as db:
         await db.execute("VACUUM")
         await db.commit()
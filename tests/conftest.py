@@ -0,0 +1,14 @@
+import httpx
+import pytest
+
+from src.app.main import app
+
+
+@pytest.fixture(scope="session")
+def transport():
+    """One ASGITransport shared by every HTTP-level test.
+
+    Tests build a short-lived AsyncClient around it; the transport (and
+    the app behind it) is constructed once per session.
+    """
+    return httpx.ASGITransport(app=app)
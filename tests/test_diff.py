@@ -1,17 +1,26 @@
-from src.core.diff import diff_texts_html
+import pytest
 
 
-def test_diff_texts_html_basic():
+@pytest.fixture(scope="module")
+def diff():
+    # Import once per module so the optional-dependency probes in
+    # src.core.diff run a single time, not per test.
+    from src.core.diff import diff_texts_html
+
+    return diff_texts_html
+
+
+def test_diff_texts_html_basic(diff):
     a = "The quick brown fox jumps over the lazy dog"
     b = "The quick brown fox leaps over the lazy dog"
-    html = diff_texts_html(a, b)
+    html = diff(a, b)
     assert "diff-ins" in html or "diff-del" in html
 
 
-def test_diff_texts_html_insert_and_delete():
+def test_diff_texts_html_insert_and_delete(diff):
     a = "Hello world"
     b = "Hello brave new world"
-    html = diff_texts_html(a, b)
+    html = diff(a, b)
     assert "brave" in html
     assert "new" in html
     assert "diff-ins" in html
@@ -1,11 +1,13 @@
-from fastapi.testclient import TestClient
+import httpx
+import pytest
 
-from src.app.main import app
 
-
-def test_security_headers_present():
-    client = TestClient(app)
-    r = client.get("/")
+@pytest.mark.asyncio
+async def test_security_headers_present(transport):
+    # ASGITransport talks to the app in-process on the test's own event
+    # loop; no server thread or sync shim like TestClient spins up.
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.get("/")
     assert r.status_code == 200
     # Common security headers
     assert "Content-Security-Policy" in r.headers